@@ -0,0 +1,256 @@
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Awaitable, Callable
+
+from common.config.environment import SHARED_CACHE_MAX_ROWS, SHARED_CACHE_PATH
+from common.response.FastJSONResponse import dumps
+
+
+class SharedCache:
+    # 같은 노드의 모든 워커 프로세스가 공유하는 SQLite 캐시 (WAL 모드)
+    # - get_or_create: 캐시 미스 시 한 워커만 값을 계산하고 나머지는 결과를 기다림 (single-flight)
+    # - 만료된 값은 조회 시 삭제하고, purge_periodically 가 주기적으로 만료 값 삭제 + MAX_ROWS 초과분 정리
+    PATH = SHARED_CACHE_PATH
+    MAX_ROWS = SHARED_CACHE_MAX_ROWS  # 최대 보관 수 (초과 시 만료가 가장 빠른 값부터 삭제)
+    PURGE_INTERVAL = 60 * 5  # 만료 값 정리 간격 (sec)
+    LOCK_TTL = 60.0  # 계산 중 워커가 죽었을 때 잠금이 풀리는 시간 (sec)
+    POLL_INTERVAL = 0.05  # 다른 워커의 계산 결과를 확인하는 간격 (sec)
+    BUSY_TIMEOUT_MS = 5000
+
+    _conn: sqlite3.Connection | None = None
+    _db_lock = threading.Lock()  # 연결 하나를 여러 스레드에서 사용하므로 직렬화
+    _inflight: dict[str, asyncio.Future] = {}  # 프로세스 내부 single-flight
+
+    @classmethod
+    def open(cls, path: str | None = None):
+        with cls._db_lock:
+            if cls._conn is not None:
+                return
+            conn = sqlite3.connect(path or cls.PATH, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA busy_timeout={cls.BUSY_TIMEOUT_MS}")
+            conn.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT, expires_at REAL)")
+            conn.execute("CREATE INDEX IF NOT EXISTS cache_expires_at ON cache (expires_at)")
+            conn.execute("CREATE TABLE IF NOT EXISTS locks (key TEXT PRIMARY KEY, expires_at REAL)")
+            cls._conn = conn
+
+    @classmethod
+    def close(cls):
+        with cls._db_lock:
+            if cls._conn is not None:
+                cls._conn.close()
+                cls._conn = None
+
+    @classmethod
+    def _execute(cls, sql: str, params: tuple = ()) -> int:
+        if cls._conn is None:
+            cls.open()
+        with cls._db_lock:
+            return cls._conn.execute(sql, params).rowcount
+
+    @classmethod
+    def _fetchone(cls, sql: str, params: tuple = ()) -> tuple | None:
+        if cls._conn is None:
+            cls.open()
+        with cls._db_lock:
+            return cls._conn.execute(sql, params).fetchone()
+
+    # ---- 동기 API ----
+    # 만료되지 않은 값의 JSON 문자열 (만료된 값은 삭제)
+    @classmethod
+    def _get_text(cls, key: str) -> str | None:
+        now = time.time()
+        row = cls._fetchone("SELECT value, expires_at FROM cache WHERE key = ?", (key,))
+        if row is None:
+            return None
+        if row[1] < now:
+            cls._execute("DELETE FROM cache WHERE key = ? AND expires_at < ?", (key, now))
+            return None
+        return row[0]
+
+    @classmethod
+    def get_sync(cls, key: str) -> Any | None:
+        text = cls._get_text(key)
+        return json.loads(text) if text is not None else None
+
+    # 저장된 JSON 을 디코딩하지 않고 bytes 로 반환 (응답 본문에 그대로 사용)
+    @classmethod
+    def get_raw_sync(cls, key: str) -> bytes | None:
+        text = cls._get_text(key)
+        return text.encode("utf-8") if text is not None else None
+
+    # 여러 키를 한 번에 조회 (만료/없는 키는 결과에서 제외)
+    @classmethod
+    def get_many_sync(cls, keys: list[str]) -> dict[str, Any]:
+        if not keys:
+            return {}
+        if cls._conn is None:
+            cls.open()
+        placeholders = ",".join("?" * len(keys))
+        with cls._db_lock:
+            rows = cls._conn.execute(f"SELECT key, value FROM cache WHERE key IN ({placeholders}) AND expires_at >= ?",
+                                     (*keys, time.time())).fetchall()
+        return {key: json.loads(value) for key, value in rows}
+
+    @classmethod
+    def set_sync(cls, key: str, value: Any, ttl: float):
+        cls._execute("INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                     (key, dumps(value).decode("utf-8"), time.time() + ttl))  # 응답과 같은 직렬화 (ETag 일치)
+
+    # 이미 인코딩된 JSON bytes 를 그대로 저장
+    @classmethod
+    def set_raw_sync(cls, key: str, value: bytes, ttl: float):
+        cls._execute("INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                     (key, value.decode("utf-8"), time.time() + ttl))
+
+    @classmethod
+    def set_many_sync(cls, items: dict[str, Any], ttl: float):
+        if not items:
+            return
+        if cls._conn is None:
+            cls.open()
+        expires_at = time.time() + ttl
+        rows = [(key, dumps(value).decode("utf-8"), expires_at) for key, value in items.items()]
+        with cls._db_lock:
+            cls._conn.execute("BEGIN")  # 한 트랜잭션으로 저장
+            try:
+                cls._conn.executemany("INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)", rows)
+                cls._conn.execute("COMMIT")
+            except sqlite3.Error:
+                cls._conn.execute("ROLLBACK")
+                raise
+
+    @classmethod
+    def delete_sync(cls, key: str):
+        cls._execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    # 만료 값 삭제 후 MAX_ROWS 를 넘는 만큼 만료가 가장 빠른 값부터 삭제 -> 삭제한 수 반환
+    @classmethod
+    def purge_expired_sync(cls) -> int:
+        now = time.time()
+        removed = cls._execute("DELETE FROM cache WHERE expires_at < ?", (now,))
+        cls._execute("DELETE FROM locks WHERE expires_at < ?", (now,))
+        count = cls._fetchone("SELECT COUNT(*) FROM cache")[0]
+        if count > cls.MAX_ROWS:
+            removed += cls._execute(
+                "DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY expires_at LIMIT ?)",
+                (count - cls.MAX_ROWS,),
+            )
+        return removed
+
+    @classmethod
+    def _acquire_sync(cls, key: str) -> bool:
+        now = time.time()
+        cls._execute("DELETE FROM locks WHERE key = ? AND expires_at < ?", (key, now))
+        inserted = cls._execute("INSERT OR IGNORE INTO locks (key, expires_at) VALUES (?, ?)",
+                                (key, now + cls.LOCK_TTL))
+        return inserted == 1
+
+    @classmethod
+    def _release_sync(cls, key: str):
+        cls._execute("DELETE FROM locks WHERE key = ?", (key,))
+
+    # ---- 비동기 API (SQLite 작업은 스레드에서 실행) ----
+    @classmethod
+    async def get(cls, key: str) -> Any | None:
+        return await asyncio.to_thread(cls.get_sync, key)
+
+    @classmethod
+    async def get_raw(cls, key: str) -> bytes | None:
+        return await asyncio.to_thread(cls.get_raw_sync, key)
+
+    @classmethod
+    async def get_many(cls, keys: list[str]) -> dict[str, Any]:
+        return await asyncio.to_thread(cls.get_many_sync, keys)
+
+    @classmethod
+    async def set_many(cls, items: dict[str, Any], ttl: float):
+        await asyncio.to_thread(cls.set_many_sync, items, ttl)
+
+    @classmethod
+    async def set(cls, key: str, value: Any, ttl: float):
+        await asyncio.to_thread(cls.set_sync, key, value, ttl)
+
+    @classmethod
+    async def set_raw(cls, key: str, value: bytes, ttl: float):
+        await asyncio.to_thread(cls.set_raw_sync, key, value, ttl)
+
+    @classmethod
+    async def delete(cls, key: str):
+        await asyncio.to_thread(cls.delete_sync, key)
+
+    # 앱 수명주기 동안 주기적으로 캐시 정리 (워커마다 실행되어도 같은 작업이라 안전)
+    @classmethod
+    async def purge_periodically(cls):
+        while True:
+            try:
+                removed = await asyncio.to_thread(cls.purge_expired_sync)
+                if removed:
+                    print(f"공유 캐시 정리 -> {removed}개 삭제")
+            except sqlite3.Error as e:
+                print(f"공유 캐시 정리 실패: {e}")
+            await asyncio.sleep(cls.PURGE_INTERVAL)
+
+    @classmethod
+    # raw=True 이면 factory 가 JSON bytes 를 반환하고, 저장/반환도 디코딩 없이 bytes 로 처리
+    async def get_or_create(cls, key: str, ttl: float, factory: Callable[[], Awaitable[Any]],
+                            should_cache: Callable[[Any], bool] | None = None, raw: bool = False) -> Any:
+        value = await (cls.get_raw(key) if raw else cls.get(key))
+        if value is not None:
+            return value
+
+        # 같은 프로세스에서 이미 계산 중이면 그 결과를 공유
+        inflight = cls._inflight.get(key)
+        if inflight is not None:
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                # 계산하던 요청만 취소된 경우 -> 대기하던 요청은 다시 시도
+                if inflight.cancelled() and not asyncio.current_task().cancelling():
+                    return await cls.get_or_create(key, ttl, factory, should_cache, raw)
+                raise
+
+        future = asyncio.get_running_loop().create_future()
+        cls._inflight[key] = future
+        try:
+            value = await cls._create_across_workers(key, ttl, factory, should_cache, raw)
+            future.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # 대기자가 없을 때 경고 방지
+            raise
+        finally:
+            cls._inflight.pop(key, None)
+
+    @classmethod
+    async def _create_across_workers(cls, key: str, ttl: float, factory: Callable[[], Awaitable[Any]],
+                                     should_cache: Callable[[Any], bool] | None, raw: bool) -> Any:
+        load = cls.get_raw if raw else cls.get
+        store = cls.set_raw if raw else cls.set
+        # 잠금은 LOCK_TTL 이 지나면 만료되어 다음 시도에서 획득하므로 대기 시간도 LOCK_TTL 이내
+        while True:
+            if await asyncio.to_thread(cls._acquire_sync, key):
+                try:
+                    value = await load(key)  # 잠금 획득 전 다른 워커가 저장했을 수 있음
+                    if value is not None:
+                        return value
+                    value = await factory()
+                    if value is not None and (should_cache is None or should_cache(value)):
+                        await store(key, value, ttl)
+                    return value
+                finally:
+                    await asyncio.to_thread(cls._release_sync, key)
+
+            # 다른 워커가 계산 중 -> 결과가 저장될 때까지 대기
+            await asyncio.sleep(cls.POLL_INTERVAL)
+            value = await load(key)
+            if value is not None:
+                return value
@@ -12,4 +12,50 @@ NAVER_PLACE_SEARCH_URL = os.getenv("NAVER_PLACE_SEARCH_URL")
 BACKEND_URL = os.getenv("BACKEND_URL")
 YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY")
 PROXY_USERNAME = os.getenv("PROXY_USERNAME")
-PROXY_PASSWORD = os.getenv("PROXY_PASSWORD")
\ No newline at end of file
+PROXY_PASSWORD = os.getenv("PROXY_PASSWORD")
+
+# 컨테이너 CPU 제한(cgroup quota)을 반영한 사용 가능 코어 수 (os.cpu_count 는 호스트 전체 코어 수를 반환)
+def available_cpu_count() -> int:
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:  # cgroup v2: "<quota> <period>" 또는 "max <period>"
+            quota, period = f.read().split()
+        if quota != "max":
+            return max(1, int(int(quota) / int(period)))
+    except (OSError, ValueError):
+        pass
+    try:
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as f, open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as g:
+            quota, period = int(f.read()), int(g.read())  # cgroup v1: 제한이 없으면 quota = -1
+        if quota > 0:
+            return max(1, quota // period)
+    except (OSError, ValueError):
+        pass
+    return len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+
+
+# 서버 실행 설정
+APP_ENV = os.getenv("APP_ENV", "development")  # production 이면 멀티 워커 모드로 실행
+SERVER_HOST = os.getenv("SERVER_HOST", "0.0.0.0")
+SERVER_PORT = int(os.getenv("SERVER_PORT", "8000"))
+# 워커마다 OpenAI 클라이언트/동시 처리 한도/SQLite 연결을 따로 가지므로 기본값은 사용 가능 코어 수, 최대 4
+MAX_DEFAULT_WORKERS = 4
+SERVER_WORKERS = int(os.getenv("SERVER_WORKERS", str(min(available_cpu_count(), MAX_DEFAULT_WORKERS))))
+SERVER_ACCESS_LOG = os.getenv("SERVER_ACCESS_LOG", "true").lower() == "true"
+SHARED_CACHE_PATH = os.getenv("SHARED_CACHE_PATH", "/tmp/algoboza-cache.sqlite3")  # 워커 간 공유 캐시 파일
+SHARED_CACHE_MAX_ROWS = int(os.getenv("SHARED_CACHE_MAX_ROWS", "50000"))  # 공유 캐시 최대 보관 수
+
+# HTTP 캐시 정책 (Cache-Control 헤더 값)
+SUMMARY_CACHE_CONTROL = os.getenv("SUMMARY_CACHE_CONTROL", "public, max-age=3600, stale-while-revalidate=86400")
+RECOMMEND_CACHE_CONTROL = os.getenv("RECOMMEND_CACHE_CONTROL", "private, max-age=300")
+
+# 요청 단위 프로파일링 (X-Profile 헤더 값이 PROFILE_TOKEN 과 같거나 샘플링에 걸린 요청만)
+PROFILE_ENABLED = os.getenv("PROFILE_ENABLED", "false").lower() == "true"
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0.0"))  # 0.0 ~ 1.0
+PROFILE_TOKEN = os.getenv("PROFILE_TOKEN")  # 헤더 요청/관리자 API 인증 값 (없으면 비활성)
+PROFILE_DIR = os.getenv("PROFILE_DIR", "/tmp/algoboza-profiles")
+PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", "100"))  # 보관할 최대 프로파일 수 (초과 시 오래된 것부터 삭제)
+
+# upstream(OpenAI, YouTube, Naver) 호출 기록/재생 (off | record | replay)
+UPSTREAM_MODE = os.getenv("UPSTREAM_MODE", "off")
+UPSTREAM_TRACE_DIR = os.getenv("UPSTREAM_TRACE_DIR", "/tmp/algoboza-traces")
+UPSTREAM_REPLAY_LATENCY = os.getenv("UPSTREAM_REPLAY_LATENCY", "false").lower() == "true"  # 기록된 응답 시간 재현
@@ -5,11 +5,14 @@ from fastapi import Request
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
 
+from common.limiter.AdaptiveLimiter import OverloadedError
+
 log = logging.getLogger(__name__)
 
 
 def init_exception_handler(app):
     app.add_exception_handler(RequestValidationError, validation_exception_handler)
+    app.add_exception_handler(OverloadedError, overloaded_exception_handler)
     app.add_exception_handler(Exception, generic_exception_handler)
 
 
@@ -41,6 +44,19 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     return error_response(exc=exc, status_code=400)
 
 
+# 동시 처리 한도 초과 (잠시 후 재시도 안내)
+async def overloaded_exception_handler(request: Request, exc: OverloadedError):
+    log.warning(f"Overloaded: {exc.name}")
+    return JSONResponse(
+        status_code=503,
+        content={
+            "error": str(exc),
+            "detail": {"retry_after": exc.retry_after}
+        },
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
 # 일반 Exception 처리 (예외 누락 방지)
 async def generic_exception_handler(request: Request, exc: Exception):
     log.exception("Unhandled exception:")
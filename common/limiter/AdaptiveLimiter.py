@@ -0,0 +1,93 @@
+import math
+import time
+from contextlib import asynccontextmanager
+
+import httpx
+import openai
+from googleapiclient.errors import HttpError
+
+from common.replay.UpstreamRecorder import RecordedUpstreamError
+
+# 한도를 줄이는 upstream 실패 (그 외 예외는 요청 자체의 문제로 보고 한도에 반영하지 않음)
+UPSTREAM_ERRORS = (openai.APIError, HttpError, httpx.HTTPError, TimeoutError, ConnectionError,
+                   RecordedUpstreamError)
+
+
+class OverloadedError(Exception):
+    # 동시 처리 한도를 넘은 요청 (503 + Retry-After 로 응답)
+    def __init__(self, name: str, retry_after: int):
+        super().__init__(f"{name} is overloaded")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class AdaptiveLimiter:
+    # 상위 API(OpenAI 등) 응답 시간에 따라 동시 처리 한도를 조절하는 AIMD limiter (워커 단위)
+    # - 목표 시간 안에 성공: 한도 += 1 / 한도 (한도만큼 성공할 때마다 1 증가)
+    # - 목표 시간 초과 또는 upstream 실패: 한도 *= BACKOFF (평균 응답 시간에 한 번만 감소)
+    # - 그 외 예외(잘못된 요청 등): 한도 변화 없음
+    # - 한도를 넘은 요청은 대기열 없이 바로 OverloadedError
+    BACKOFF = 0.8
+    LATENCY_SMOOTHING = 0.2  # 평균 응답 시간(EWMA) 가중치
+
+    def __init__(self, name: str, target_latency: float, initial_limit: int = 8,
+                 min_limit: int = 1, max_limit: int = 64):
+        self.name = name
+        self.target_latency = target_latency
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.limit = float(initial_limit)
+        self.in_flight = 0
+        self.avg_latency = target_latency / 2
+        self.last_decrease = 0.0
+
+    def try_acquire(self) -> bool:
+        if self.in_flight >= int(self.limit):
+            return False
+        self.in_flight += 1
+        return True
+
+    @staticmethod
+    def is_upstream_error(exc: BaseException) -> bool:
+        # 서비스 코드가 upstream 예외를 일반 Exception 으로 감싸는 경우가 있어 원인 예외까지 확인
+        seen = set()
+        while exc is not None and id(exc) not in seen:
+            if isinstance(exc, UPSTREAM_ERRORS):
+                return True
+            seen.add(id(exc))
+            exc = exc.__cause__ or exc.__context__
+        return False
+
+    def release(self, latency: float, success: bool = True):
+        self.in_flight -= 1
+        self.avg_latency += self.LATENCY_SMOOTHING * (latency - self.avg_latency)
+
+        if success and latency <= self.target_latency:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            return
+
+        # 동시에 끝난 느린 요청들로 한도가 연속으로 줄어들지 않도록 감소 간격 제한
+        now = time.monotonic()
+        if now - self.last_decrease >= self.avg_latency:
+            self.limit = max(self.min_limit, self.limit * self.BACKOFF)
+            self.last_decrease = now
+
+    def retry_after(self) -> int:
+        return max(1, math.ceil(self.avg_latency))
+
+    @asynccontextmanager
+    async def acquire(self):
+        if not self.try_acquire():
+            print(f"{self.name} 과부하 -> limit : {int(self.limit)}, in_flight : {self.in_flight}")
+            raise OverloadedError(self.name, self.retry_after())
+
+        start_time = time.monotonic()
+        try:
+            yield
+        except BaseException as e:
+            if self.is_upstream_error(e):
+                self.release(time.monotonic() - start_time, success=False)
+            else:
+                self.in_flight -= 1
+            raise
+        self.release(time.monotonic() - start_time)
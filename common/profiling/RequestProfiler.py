@@ -0,0 +1,233 @@
+import asyncio
+import hmac
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+
+from fastapi import APIRouter, Header, HTTPException
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import FileResponse, JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from common.config.environment import PROFILE_DIR, PROFILE_ENABLED, PROFILE_MAX_FILES, PROFILE_SAMPLE_RATE, \
+    PROFILE_TOKEN
+from common.replay.UpstreamRecorder import upstream_timings
+
+router = APIRouter()
+
+PROFILE_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+
+class StackSampler(threading.Thread):
+    # 이벤트 루프 스레드의 호출 스택을 주기적으로 수집 (flamegraph 용 folded stack 형식)
+    def __init__(self, thread_id: int, interval: float):
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                frame = frame.f_back
+            self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+class LoopLagMonitor:
+    # sleep 이 예정보다 늦게 깨어난 시간 = 이벤트 루프가 막혀 있던 시간
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.lags: list[float] = []
+        self._task: asyncio.Task | None = None
+
+    async def _run(self):
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.lags.append(max(0.0, time.perf_counter() - start - self.interval))
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+    def summary(self) -> dict:
+        if not self.lags:
+            return {"samples": 0, "max": 0.0, "avg": 0.0}
+        return {"samples": len(self.lags), "max": max(self.lags), "avg": sum(self.lags) / len(self.lags)}
+
+
+class RequestProfiler:
+    # 요청 하나를 프로파일링해 PROFILE_DIR/{id}.json 에 저장 (워커당 동시에 하나만)
+    # - 샘플링 스택은 이벤트 루프 스레드 전체 기준이라 동시에 처리 중인 다른 요청도 포함될 수 있음
+    # - 저장된 파일이 MAX_FILES 를 넘으면 오래된 파일부터 삭제
+    SAMPLE_INTERVAL = 0.005  # 스택 수집 간격 (sec)
+    LAG_INTERVAL = 0.01  # 이벤트 루프 지연 측정 간격 (sec)
+    TOP_STACKS = 200  # 저장할 최대 스택 수
+    MAX_FILES = PROFILE_MAX_FILES
+
+    enabled = PROFILE_ENABLED
+    sample_rate = PROFILE_SAMPLE_RATE
+    _active = False
+
+    @classmethod
+    def should_profile(cls, headers: Headers) -> bool:
+        if not cls.enabled or cls._active:
+            return False
+        token = headers.get("x-profile")
+        if PROFILE_TOKEN and token and is_valid_token(token):
+            return True
+        return random.random() < cls.sample_rate
+
+    @classmethod
+    async def profile(cls, app: ASGIApp, scope: Scope, receive: Receive, send: Send):
+        cls._active = True
+        profile_id = uuid.uuid4().hex
+        sampler = StackSampler(threading.get_ident(), cls.SAMPLE_INTERVAL)
+        lag_monitor = LoopLagMonitor(cls.LAG_INTERVAL)
+        timings_token = upstream_timings.set([])
+        started_at = time.time()
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_with_profile_id(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message).append("X-Profile-Id", profile_id)
+            await send(message)
+
+        sampler.start()
+        lag_monitor.start()
+        try:
+            await app(scope, receive, send_with_profile_id)
+        finally:
+            duration = time.perf_counter() - start
+            await lag_monitor.stop()
+            await asyncio.to_thread(sampler.stop)
+            upstream = upstream_timings.get()
+            upstream_timings.reset(timings_token)
+            cls._active = False
+
+            artifact = {
+                "id": profile_id,
+                "method": scope["method"],
+                "path": scope["path"],
+                "status_code": status_code,
+                "started_at": started_at,
+                "duration": duration,
+                "sample_interval": cls.SAMPLE_INTERVAL,
+                "samples": sampler.samples,
+                "event_loop_lag": lag_monitor.summary(),
+                "upstream": upstream,
+                "stacks": dict(sampler.stacks.most_common(cls.TOP_STACKS)),
+            }
+            await asyncio.to_thread(cls.save, profile_id, artifact)
+            print(f"프로파일 저장 -> {scope['path']} : {profile_id} ({duration:.2f}초)")
+
+    @classmethod
+    def save(cls, profile_id: str, artifact: dict):
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        with open(os.path.join(PROFILE_DIR, f"{profile_id}.json"), "w", encoding="utf-8") as f:
+            json.dump(artifact, f, ensure_ascii=False)
+        cls.prune()
+
+    # 최근 MAX_FILES 개만 남기고 오래된 프로파일 삭제
+    @classmethod
+    def prune(cls):
+        paths = [entry.path for entry in os.scandir(PROFILE_DIR) if entry.name.endswith(".json")]
+        if len(paths) <= cls.MAX_FILES:
+            return
+        paths.sort(key=os.path.getmtime)
+        for path in paths[:len(paths) - cls.MAX_FILES]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:  # 다른 워커가 먼저 삭제한 경우
+                pass
+
+
+class RequestProfilerMiddleware:
+    # 순수 ASGI 미들웨어 (프로파일링이 꺼져 있거나 대상이 아닌 요청은 추가 작업 없이 바로 전달)
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not RequestProfiler.enabled \
+                or not RequestProfiler.should_profile(Headers(scope=scope)):
+            await self.app(scope, receive, send)
+            return
+        await RequestProfiler.profile(self.app, scope, receive, send)
+
+
+def init_request_profiler(app):
+    app.add_middleware(RequestProfilerMiddleware)
+    app.include_router(router, prefix="/admin/profiling")
+
+
+# 토큰 비교 (응답 시간으로 토큰이 유추되지 않도록 상수 시간 비교)
+def is_valid_token(token: str) -> bool:
+    return hmac.compare_digest(token.encode("utf-8"), PROFILE_TOKEN.encode("utf-8"))
+
+
+# 관리자 API 인증
+def auth(admin_token: str | None):
+    if not PROFILE_TOKEN or not admin_token or not is_valid_token(admin_token):
+        raise HTTPException(status_code=403, detail="admin token is invalid")
+
+
+# 프로파일링 설정 변경 (워커 단위)
+@router.post("")
+async def update_profiling(enabled: bool | None = None,
+                           sample_rate: float | None = None,
+                           x_admin_token: str | None = Header(None)):
+    auth(x_admin_token)
+    if enabled is not None:
+        RequestProfiler.enabled = enabled
+    if sample_rate is not None:
+        RequestProfiler.sample_rate = min(1.0, max(0.0, sample_rate))
+    return JSONResponse(content={"enabled": RequestProfiler.enabled, "sample_rate": RequestProfiler.sample_rate})
+
+
+# 저장된 프로파일 목록
+@router.get("/profiles")
+async def list_profiles(x_admin_token: str | None = Header(None)):
+    auth(x_admin_token)
+    if not os.path.isdir(PROFILE_DIR):
+        return JSONResponse(content=[])
+    names = sorted(os.listdir(PROFILE_DIR), key=lambda name: os.path.getmtime(os.path.join(PROFILE_DIR, name)),
+                   reverse=True)
+    return JSONResponse(content=[name.removesuffix(".json") for name in names if name.endswith(".json")])
+
+
+# 프로파일 다운로드
+@router.get("/profiles/{profile_id}")
+async def download_profile(profile_id: str, x_admin_token: str | None = Header(None)):
+    auth(x_admin_token)
+    path = os.path.join(PROFILE_DIR, f"{profile_id}.json")
+    if not PROFILE_ID_PATTERN.match(profile_id) or not os.path.isfile(path):
+        raise HTTPException(status_code=404, detail="profile not found")
+    return FileResponse(path, media_type="application/json", filename=f"{profile_id}.json")
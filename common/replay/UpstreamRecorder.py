@@ -0,0 +1,122 @@
+import asyncio
+import glob
+import hashlib
+import inspect
+import json
+import os
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Callable
+
+from common.config.environment import UPSTREAM_MODE, UPSTREAM_REPLAY_LATENCY, UPSTREAM_TRACE_DIR
+
+# 현재 요청에서 호출한 upstream 별 소요 시간 (프로파일링 중인 요청만 설정됨)
+upstream_timings: ContextVar[list | None] = ContextVar("upstream_timings", default=None)
+
+
+class UpstreamNotRecorded(Exception):
+    # replay 모드에서 기록되지 않은 요청을 호출한 경우
+    pass
+
+
+class RecordedUpstreamError(Exception):
+    # record 모드에서 기록된 upstream 실패를 replay 모드에서 다시 발생시킨 경우
+    def __init__(self, service: str, error_type: str, message: str):
+        super().__init__(f"{service} {error_type}: {message}")
+        self.service = service
+        self.error_type = error_type
+
+
+class UpstreamRecorder:
+    # OpenAI / YouTube / Naver 호출을 기록하고 오프라인에서 재생
+    # - record: 실제 호출 후 요청/응답/소요 시간을 {service}.{pid}.jsonl 에 추가
+    # - replay: 같은 요청의 기록된 응답을 반환 (같은 요청이 여러 번 기록되었으면 순서대로 돌아가며 반환)
+    # - 실패한 호출은 예외 타입/메시지를 기록하고 replay 시 RecordedUpstreamError 로 다시 발생
+    # - request 는 응답을 결정하는 값만 담아야 함 (랜덤 값 등은 fn 안에서 만들어야 replay 가능)
+    MODES = ("off", "record", "replay")
+
+    mode = UPSTREAM_MODE if UPSTREAM_MODE in MODES else "off"
+    trace_dir = UPSTREAM_TRACE_DIR
+    replay_latency = UPSTREAM_REPLAY_LATENCY
+
+    _write_lock = threading.Lock()
+    _traces: dict[str, list[dict]] | None = None
+    _cursors: dict[str, int] = {}
+
+    @staticmethod
+    def make_key(service: str, request: Any) -> str:
+        text = json.dumps([service, request], sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+    @classmethod
+    def _load_traces(cls) -> dict[str, list[dict]]:
+        if cls._traces is None:
+            traces: dict[str, list[dict]] = {}
+            for path in sorted(glob.glob(os.path.join(cls.trace_dir, "*.jsonl"))):
+                with open(path, encoding="utf-8") as f:
+                    for line in f:
+                        if line.strip():
+                            record = json.loads(line)
+                            traces.setdefault(record["key"], []).append(record)
+            cls._traces = traces
+        return cls._traces
+
+    @classmethod
+    def _write(cls, service: str, record: dict):
+        os.makedirs(cls.trace_dir, exist_ok=True)
+        path = os.path.join(cls.trace_dir, f"{service}.{os.getpid()}.jsonl")
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        with cls._write_lock, open(path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+    @classmethod
+    async def _replay(cls, service: str, key: str) -> Any:
+        records = cls._load_traces().get(key)
+        if not records:
+            raise UpstreamNotRecorded(f"{service} 요청이 기록되어 있지 않습니다. (key: {key})")
+        cursor = cls._cursors.get(key, 0)
+        cls._cursors[key] = cursor + 1
+        record = records[cursor % len(records)]
+        if cls.replay_latency:
+            await asyncio.sleep(record.get("latency", 0))
+        if "error" in record:
+            raise RecordedUpstreamError(service, record["error"]["type"], record["error"]["message"])
+        return record["response"]
+
+    # 파일 쓰기는 이벤트 루프를 막지 않도록 스레드에서 실행
+    @classmethod
+    async def _record(cls, service: str, request: Any, start_time: float, **result):
+        await asyncio.to_thread(cls._write, service, {
+            "key": cls.make_key(service, request),
+            "service": service,
+            "request": request,
+            **result,
+            "latency": time.perf_counter() - start_time,
+            "recorded_at": time.time(),
+        })
+
+    # fn 은 JSON 으로 저장 가능한 값을 반환하는 함수 (동기/비동기 모두 가능)
+    @classmethod
+    async def call(cls, service: str, request: Any, fn: Callable[[], Any]) -> Any:
+        start_time = time.perf_counter()
+        try:
+            if cls.mode == "replay":
+                return await cls._replay(service, cls.make_key(service, request))
+
+            try:
+                response = fn()
+                if inspect.isawaitable(response):
+                    response = await response
+            except Exception as e:
+                if cls.mode == "record":
+                    await cls._record(service, request, start_time,
+                                      error={"type": type(e).__name__, "message": str(e)})
+                raise
+            if cls.mode == "record":
+                await cls._record(service, request, start_time, response=response)
+            return response
+        finally:
+            timings = upstream_timings.get()
+            if timings is not None:
+                timings.append({"service": service, "latency": time.perf_counter() - start_time})
@@ -0,0 +1,42 @@
+import json
+from typing import Any
+
+from pydantic import BaseModel
+from starlette.responses import JSONResponse
+
+try:  # orjson 은 의존성에 포함되어 있으나, 설치되지 않은 개발 환경에서는 표준 json 으로 대체
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(obj: Any):
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+# 객체 -> JSON bytes
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":"),
+                      default=_default).encode("utf-8")
+
+
+# 이미 인코딩된 값들로 JSON 객체 생성
+def raw_object(**fields: bytes) -> bytes:
+    return b"{" + b",".join(dumps(key) + b":" + value for key, value in fields.items()) + b"}"
+
+
+# 이미 인코딩된 data 를 다시 직렬화하지 않고 {"meta": ..., "data": ...} 응답 본문으로 합침
+def envelope(meta: dict | bytes, data: bytes) -> bytes:
+    return raw_object(meta=meta if isinstance(meta, bytes) else dumps(meta), data=data)
+
+
+class FastJSONResponse(JSONResponse):
+    # content 가 bytes 이면 그대로 전송 (캐시된 응답 재사용)
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, (bytes, bytearray)):
+            return bytes(content)
+        return dumps(content)
@@ -0,0 +1,35 @@
+import hashlib
+
+from starlette.responses import Response
+
+NO_STORE = "no-store"
+
+
+# 캐시된 JSON bytes 와 프롬프트 버전으로 약한 ETag 생성
+# (응답 본문에는 요청마다 달라지는 meta.running_time 이 포함되어 byte 단위로 같지 않으므로 W/ 사용)
+def make_etag(*parts: str | bytes) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part.encode("utf-8") if isinstance(part, str) else part)
+        digest.update(b"\x00")
+    return f'W/"{digest.hexdigest()}"'
+
+
+# If-None-Match 헤더에 현재 ETag 가 포함되어 있는지 확인 (약한 비교, GET/HEAD 에서만 사용)
+def is_not_modified(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    opaque = etag.removeprefix("W/")
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == opaque:
+            return True
+    return False
+
+
+def cache_headers(etag: str, cache_control: str) -> dict[str, str]:
+    return {"ETag": etag, "Cache-Control": cache_control}
+
+
+def not_modified_response(etag: str, cache_control: str) -> Response:
+    return Response(status_code=304, headers=cache_headers(etag, cache_control))
@@ -3,8 +3,8 @@ from typing import List
 
 from fastapi import APIRouter, Header
 from pydantic import BaseModel
-from starlette.responses import JSONResponse
 
+from common.response.FastJSONResponse import FastJSONResponse
 from domain.DTO.DTO import KeywordDTO
 from domain.service.MergeKeywords import MargeKeywords
 
@@ -20,7 +20,7 @@ async def keyword_combinations(request: List[str]):
     data = await MargeKeywords.get_shopping_keywords(request)
     pprint(data)
 
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=200,
         content=data
     )
@@ -31,7 +31,7 @@ async def keyword_combinations(request: List[str]):
     data = await MargeKeywords.get_place_keywords(request)
     pprint(data)
     
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=200,
         content=data
     )
@@ -1,20 +1,37 @@
+import hashlib
 import json
 import os
 import time
 
 from fastapi import APIRouter, Header
 from fastapi.exceptions import RequestValidationError
-from pydantic import BaseModel
-from starlette.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter, ValidationError
 
+from common.cache.SharedCache import SharedCache
+from common.config.environment import RECOMMEND_CACHE_CONTROL, SUMMARY_CACHE_CONTROL
+from common.limiter.AdaptiveLimiter import AdaptiveLimiter
+from common.response.FastJSONResponse import FastJSONResponse, dumps, envelope, raw_object
+from common.response.HttpCache import NO_STORE, cache_headers, is_not_modified, make_etag, not_modified_response
 from domain.DTO.VideoInfoDTO import VideoInfoDTO
-from domain.service.YoutubeSummary import YoutubeSummary
+from domain.service.InterestKeywordBuilder import InterestKeywordBuilder
+from domain.service.YoutubeSummary import SummaryUpstreamError, YoutubeSummary
 from domain.service.YoutubeRecommend import YoutubeRecommend
 
 # 과금 방지를 위해 api key를 따로 만들었으나 필요 없을듯
 
 router = APIRouter()
 
+SUMMARY_CACHE_TTL = 60 * 60 * 24  # 영상 요약 캐시 유지 시간 (sec)
+RECOMMEND_CACHE_TTL = 60 * 10  # 추천 결과 캐시 유지 시간 (sec)
+
+# GPT 를 사용하는 구간별 동시 처리 한도
+summary_limiter = AdaptiveLimiter("youtube-summary", target_latency=10.0)  # 초과 시 503
+keyword_limiter = AdaptiveLimiter("youtube-keyword", target_latency=3.0)  # 초과 시 로컬 키워드로 대체
+
+video_list_adapter = TypeAdapter(list[VideoInfoDTO])  # DTO 리스트를 dict 변환 없이 바로 JSON bytes 로 직렬화
+interest_scores_adapter = TypeAdapter(dict[str, int])
+RESULT_SEPARATOR = b"\n"  # 캐시된 추천 결과의 구분자
+
 
 # main app을 라우팅
 def init_YouTubeVideoRecommend_controller(app):
@@ -28,75 +45,204 @@ def init_YouTubeVideoRecommend_controller(app):
 #         raise RequestValidationError("API_KEY is invalid")
 #
 
+# 검색 키워드 생성 방식 (gpt: GPT 호출, 실패 시 local 대체 / local: GPT 없이 로컬 계산)
+KEYWORD_MODES = ("gpt", "local")
+
+
 # 관심사 키워드 DTO
 class CapWordsDTO(BaseModel):
     interest_scores: dict[str, int] | None = None
 
 
 # 비디오 추천 controller
+# - POST 는 조건부 요청(If-None-Match)을 처리하지 않음 (POST 응답은 브라우저/CDN 이 캐시하지 않으므로 GET 사용)
 @router.post("")
 async def recommend_video_list(request: CapWordsDTO,
                                max_search_keyword: int = 1,  # 값이 없을 경우 기본 1
                                max_results: int = 5,  # 값이 없을 경우 기본 5
+                               keyword_mode: str = "gpt",  # 값이 없을 경우 기본 gpt
                                api_key: str = Header(None)):
     # auth(api_key)
 
     if request.interest_scores is None:
         raise RequestValidationError("interest_list is None")
+    return await recommend_response(request.interest_scores, max_search_keyword, max_results, keyword_mode)
+
+
+# 비디오 추천 controller (GET, 캐시/조건부 요청 지원)
+# interest_scores 는 JSON 문자열 (예: ?interest_scores={"캠핑":10,"러닝화":5})
+@router.get("")
+async def recommend_video_list_get(interest_scores: str,
+                                   max_search_keyword: int = 1,
+                                   max_results: int = 5,
+                                   keyword_mode: str = "gpt",
+                                   api_key: str = Header(None),
+                                   if_none_match: str | None = Header(None)):
+    # auth(api_key)
+
+    try:
+        scores = interest_scores_adapter.validate_json(interest_scores)
+    except ValidationError as e:
+        raise RequestValidationError(e.errors())
+    return await recommend_response(scores, max_search_keyword, max_results, keyword_mode,
+                                    if_none_match=if_none_match, conditional=True)
+
+
+async def recommend_response(interest_scores: dict[str, int], max_search_keyword: int, max_results: int,
+                             keyword_mode: str, if_none_match: str | None = None, conditional: bool = False):
+    if keyword_mode not in KEYWORD_MODES:
+        raise RequestValidationError(f"keyword_mode must be one of {KEYWORD_MODES}")
 
     # # 시작 시간 계산
     start_time = time.time()
 
-    keyword = json.dumps(request.interest_scores)
-    interest_keyword = await YoutubeSummary.create_interest_keyword(keyword, max_search_keyword)
-    # 키워드로 검색한 VideoInfDTO 리스트
-    videos_for_keyword: list[VideoInfoDTO] = await YoutubeRecommend.search_videos_by_keyword_list(interest_keyword,
-                                                                                                  max_results)
-
-    video_data = [video.model_dump() for video in videos_for_keyword]
+    # 같은 관심사/옵션 요청이면 캐시된 결과 재사용 (GET 은 ETag 가 같으면 upstream 호출 없이 304)
+    cache_key = "recommend:" + hashlib.blake2b(
+        json.dumps([interest_scores, max_search_keyword, max_results, keyword_mode,
+                    YoutubeSummary.PROMPT_VERSION], sort_keys=True, ensure_ascii=False).encode("utf-8"),
+        digest_size=16,
+    ).hexdigest()
+    raw = await SharedCache.get_raw(cache_key)
+    if raw is not None:
+        etag = make_etag(YoutubeSummary.PROMPT_VERSION, raw)
+        if conditional and is_not_modified(if_none_match, etag):
+            return not_modified_response(etag, RECOMMEND_CACHE_CONTROL)
+    else:
+        # GPT 실패/과부하로 로컬 키워드를 사용한 결과는 캐시하지 않음
+        raw = await SharedCache.get_or_create(
+            cache_key,
+            RECOMMEND_CACHE_TTL,
+            lambda: create_recommend_result(interest_scores, max_search_keyword, max_results, keyword_mode),
+            should_cache=lambda value: not is_fallback_result(value),
+            raw=True,
+        )
+        etag = make_etag(YoutubeSummary.PROMPT_VERSION, raw)
+
+    source, interest_keyword, video_data = raw.split(RESULT_SEPARATOR, 2)
 
     end_time = time.time()  # 끝 시간 저장
     print(f"\n전체 실행 시간: {end_time - start_time:.2f}초")
 
-    return JSONResponse(
+    headers = None
+    if conditional:
+        headers = cache_headers(etag, NO_STORE if is_fallback_result(raw) else RECOMMEND_CACHE_CONTROL)
+    return FastJSONResponse(
         status_code=200,
-        content={
-            "meta": {
-                "search_keyword": interest_keyword,
-                "running_time": end_time - start_time
-            },
-            "data": video_data
-        }
+        content=envelope(
+            meta=raw_object(
+                search_keyword=interest_keyword,
+                running_time=dumps(end_time - start_time)
+            ),
+            data=video_data
+        ),
+        headers=headers
     )
 
 
+# 관심사로 영상 추천 결과 생성
+# 캐시에 디코딩 없이 바로 응답에 쓸 수 있도록 "키워드 출처\n검색 키워드 JSON\n영상 목록 JSON" bytes 로 저장
+# (압축 JSON 에는 줄바꿈 문자가 그대로 들어가지 않으므로 구분자로 사용 가능)
+async def create_recommend_result(interest_scores: dict[str, int], max_search_keyword: int, max_results: int,
+                                  keyword_mode: str) -> bytes:
+    interest_keyword, source = await create_interest_keyword(interest_scores, max_search_keyword, keyword_mode)
+    # 키워드로 검색한 VideoInfDTO 리스트
+    videos_for_keyword: list[VideoInfoDTO] = await YoutubeRecommend.search_videos_by_keyword_list(interest_keyword,
+                                                                                                  max_results)
+    return RESULT_SEPARATOR.join([source.encode("utf-8"), dumps(interest_keyword),
+                                  video_list_adapter.dump_json(videos_for_keyword)])
+
+
+def is_fallback_result(raw: bytes) -> bool:
+    return raw.startswith(b"fallback" + RESULT_SEPARATOR)
+
+
+# 관심사 점수로 검색 키워드 생성 -> (키워드 리스트, 출처: gpt | local | fallback)
+async def create_interest_keyword(interest_scores: dict[str, int], max_search_keyword: int, keyword_mode: str):
+    if keyword_mode == "local":
+        return InterestKeywordBuilder.create_interest_keyword(interest_scores, max_search_keyword), "local"
+
+    try:
+        keyword = json.dumps(interest_scores)
+        async with keyword_limiter.acquire():
+            return await YoutubeSummary.create_interest_keyword(keyword, max_search_keyword), "gpt"
+    except Exception as e:
+        # GPT 호출 실패 또는 과부하 시 로컬 키워드로 대체
+        print(f"GPT 키워드 생성 실패, 로컬 키워드로 대체: {e}")
+        return InterestKeywordBuilder.create_interest_keyword(interest_scores, max_search_keyword), "fallback"
+
+
 # 비디오 요약 controller
 @router.get("/summary")
 async def video_summary(video_id: str,
-                        api_key: str = Header(None)):
+                        api_key: str = Header(None),
+                        if_none_match: str | None = Header(None)):
     # auth(api_key)
 
     # # 시작 시간 계산
     start_time = time.time()
-    video_info: VideoInfoDTO = (await YoutubeRecommend.get_video_details([video_id])).pop()
 
-    print(f"video_info: {video_info}")
-
-    # 비디오 요약 본문 얻기
-    video_info.description = await YoutubeRecommend.get_video_description(video_info)
+    # 캐시 hit 이면 저장된 JSON bytes 를 그대로 사용 (ETag 가 같으면 upstream 호출 없이 304)
+    cache_key = f"summary:{YoutubeSummary.PROMPT_VERSION}:{video_id}"
+    cache_control = SUMMARY_CACHE_CONTROL
+    data = await SharedCache.get_raw(cache_key)
+    if data is not None:
+        etag = make_etag(YoutubeSummary.PROMPT_VERSION, data)
+        if is_not_modified(if_none_match, etag):
+            return not_modified_response(etag, cache_control)
+    else:
+        # 워커 간 공유 캐시 사용 (같은 영상 요청이 동시에 들어오면 한 번만 요약)
+        summary = await SharedCache.get_or_create(
+            cache_key,
+            SUMMARY_CACHE_TTL,
+            lambda: create_limited_video_summary(video_id),
+            should_cache=is_cacheable_summary,
+        )
+        data = dumps(summary)
+        etag = make_etag(YoutubeSummary.PROMPT_VERSION, data)
+        if not is_cacheable_summary(summary):  # 에러 응답은 클라이언트/CDN 에도 캐시하지 않음
+            cache_control = NO_STORE
 
     end_time = time.time()  # 끝 시간 저장
     print(f"\n전체 실행 시간: {end_time - start_time:.2f}초")
 
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=200,
-        content={
-            "meta": {
+        content=envelope(
+            meta={
                 "video_id": video_id,
                 "running_time": end_time - start_time  # 총 실행 시간
             },
-            "data": {
-                "description": video_info.description
-            }
-        }
+            data=data
+        ),
+        headers=cache_headers(etag, cache_control)
     )
+
+
+# 에러 또는 자막 조회 실패(일시적일 수 있음)로 요약이 없는 경우는 캐시하지 않음
+def is_cacheable_summary(summary: dict) -> bool:
+    return summary["description"] not in (YoutubeSummary.SUMMARY_ERROR_MESSAGE, YoutubeSummary.NO_DESCRIPTION_MESSAGE)
+
+
+# 동시 처리 한도 안에서 비디오 요약 생성 (캐시 hit 은 한도와 무관)
+# OpenAI 실패는 limiter 가 실패로 집계한 뒤 에러 메시지 응답으로 변환 (캐시하지 않음)
+async def create_limited_video_summary(video_id: str) -> dict:
+    try:
+        async with summary_limiter.acquire():
+            return await create_video_summary(video_id)
+    except SummaryUpstreamError:
+        return {
+            "description": YoutubeSummary.SUMMARY_ERROR_MESSAGE
+        }
+
+
+# 비디오 요약 생성
+async def create_video_summary(video_id: str) -> dict:
+    video_info: VideoInfoDTO = (await YoutubeRecommend.get_video_details([video_id])).pop()
+
+    print(f"video_info: {video_info}")
+
+    # 비디오 요약 본문 얻기
+    video_info.description = await YoutubeRecommend.get_video_description(video_info)
+    return {
+        "description": video_info.description
+    }
@@ -0,0 +1,76 @@
+import re
+
+
+class InterestKeywordBuilder:
+    # GPT 호출 없이 관심사 점수로 검색 키워드를 만드는 로컬 빌더
+    MAX_KEYWORDS = 5  # GPT 프롬프트와 동일한 최대 키워드 수
+    NGRAM_SIZE = 2  # 문자 n-gram 크기 (한글 두 글자 단위가 가장 안정적)
+    SIMILARITY_THRESHOLD = 0.6  # Dice 유사도가 이 값 이상이면 같은 그룹으로 묶음
+    CONTAINMENT_THRESHOLD = 0.8  # 짧은 키워드의 n-gram 이 이 비율 이상 포함되면 같은 그룹 ("러닝화" ⊂ "나이키 러닝화")
+
+    _WHITESPACE = re.compile(r"\s+")
+
+    # 키워드 정규화 (공백 정리, 소문자)
+    @classmethod
+    def normalize(cls, keyword: str) -> str:
+        return cls._WHITESPACE.sub(" ", keyword).strip().lower()
+
+    # 문자 n-gram 집합 (공백 제거 후 계산해 "캠핑 의자"와 "캠핑의자"를 동일하게 취급)
+    @classmethod
+    def ngrams(cls, keyword: str) -> frozenset[str]:
+        compact = keyword.replace(" ", "")
+        if len(compact) <= cls.NGRAM_SIZE:
+            return frozenset([compact]) if compact else frozenset()
+        return frozenset(compact[i:i + cls.NGRAM_SIZE] for i in range(len(compact) - cls.NGRAM_SIZE + 1))
+
+    # Dice 계수 기반 유사도
+    @staticmethod
+    def similarity(a: frozenset[str], b: frozenset[str]) -> float:
+        if not a or not b:
+            return 0.0
+        return 2 * len(a & b) / (len(a) + len(b))
+
+    # 포함 계수 (overlap coefficient): 짧은 쪽 n-gram 중 긴 쪽에 포함된 비율
+    @staticmethod
+    def containment(a: frozenset[str], b: frozenset[str]) -> float:
+        if not a or not b:
+            return 0.0
+        return len(a & b) / min(len(a), len(b))
+
+    # 길이가 비슷하면 Dice, 한쪽이 다른 쪽을 포함하면 포함 계수로 판단
+    @classmethod
+    def is_similar(cls, a: frozenset[str], b: frozenset[str]) -> bool:
+        return cls.similarity(a, b) >= cls.SIMILARITY_THRESHOLD or cls.containment(a, b) >= cls.CONTAINMENT_THRESHOLD
+
+    # 점수 순으로 정렬 후 유사 키워드를 그룹화 (대표 키워드는 그룹 내 최고 점수 키워드)
+    @classmethod
+    def group_keywords(cls, interest_scores: dict[str, int]) -> list[dict]:
+        merged: dict[str, int] = {}
+        for keyword, score in interest_scores.items():
+            normalized = cls.normalize(str(keyword))
+            if normalized:
+                merged[normalized] = merged.get(normalized, 0) + int(score or 0)
+
+        # 점수 내림차순, 동점이면 키워드 사전순 (결정적 결과 보장)
+        ordered = sorted(merged.items(), key=lambda item: (-item[1], item[0]))
+
+        groups: list[dict] = []
+        for keyword, score in ordered:
+            grams = cls.ngrams(keyword)
+            for group in groups:
+                if cls.is_similar(grams, group["ngrams"]):
+                    group["score"] += score
+                    group["members"].append(keyword)
+                    break
+            else:
+                groups.append({"keyword": keyword, "ngrams": grams, "score": score, "members": [keyword]})
+
+        return sorted(groups, key=lambda group: (-group["score"], group["keyword"]))
+
+    # 관심사 점수 -> 검색 키워드 리스트
+    @classmethod
+    def create_interest_keyword(cls, interest_scores: dict[str, int], max_search_keyword: int = 5) -> list[str]:
+        if not interest_scores:
+            return []
+        limit = max(0, min(max_search_keyword, cls.MAX_KEYWORDS))
+        return [group["keyword"] for group in cls.group_keywords(interest_scores)[:limit]]
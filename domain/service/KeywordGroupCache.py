@@ -0,0 +1,192 @@
+import copy
+import hashlib
+import json
+from collections import Counter, defaultdict
+
+from cachetools import LRUCache
+
+from common.cache.SharedCache import SharedCache
+from domain.service.InterestKeywordBuilder import InterestKeywordBuilder
+
+
+class _SetCache(LRUCache):
+    # LRU 로 밀려난 집합을 역색인에서도 제거하기 위한 LRUCache
+    def __init__(self, maxsize: int, on_evict):
+        super().__init__(maxsize=maxsize)
+        self.on_evict = on_evict
+
+    def popitem(self):
+        key, value = super().popitem()
+        self.on_evict(key)
+        return key, value
+
+
+class KeywordGroupCache:
+    # 이전 키워드 병합 결과를 재사용하기 위한 캐시
+    # - 키워드 집합 단위: 같은 집합이면 이전 결과를 그대로 반환
+    #   비슷한 집합(정규화 키워드 Jaccard 유사도 SET_SIMILARITY_THRESHOLD 이상)이면 그 집합의 키워드 할당을 재사용
+    # - 키워드 단위: 이미 분류된 키워드(또는 n-gram 유사도가 높은 키워드)는 GPT 없이 로컬에서 할당
+    # - name 을 지정하면 집합 결과와 키워드 할당을 SharedCache 에도 저장해 다른 워커와 공유
+    #   (유사도 검색은 워커 내부 색인만 사용, 다른 워커의 결과는 정확히 일치할 때 가져와 색인에 추가)
+    MAX_KEYWORDS = 5000  # 키워드 -> 그룹 할당 최대 보관 수
+    MAX_SETS = 512  # 키워드 집합 -> 결과 최대 보관 수
+    SIMILARITY_THRESHOLD = 0.8  # 잘못된 할당을 막기 위해 키워드 그룹화보다 높게 설정
+    SET_SIMILARITY_THRESHOLD = 0.6  # 집합 유사도 (공통 키워드 수 / 전체 키워드 수)
+    SHARED_TTL = 60 * 60 * 24 * 7  # 공유 캐시 유지 시간 (sec)
+
+    def __init__(self, name: str | None = None, max_keywords: int = MAX_KEYWORDS, max_sets: int = MAX_SETS,
+                 threshold: float = SIMILARITY_THRESHOLD, set_threshold: float = SET_SIMILARITY_THRESHOLD):
+        self.name = name
+        self.max_keywords = max_keywords
+        self.threshold = threshold
+        self.set_threshold = set_threshold
+        self.sets = _SetCache(max_sets, self._evict_set)  # 집합 -> {"result", "assignments"}
+        self.set_index: defaultdict[str, set[frozenset[str]]] = defaultdict(set)  # 정규화 키워드 -> 집합 (역색인)
+        self.assignments: dict[str, str] = {}  # 정규화 키워드 -> 그룹(대표 키워드 등)
+        self.keyword_ngrams: dict[str, frozenset[str]] = {}
+        self.ngram_index: defaultdict[str, set[str]] = defaultdict(set)  # n-gram -> 키워드 (역색인)
+
+    @staticmethod
+    def set_key(keywords: list[str]) -> frozenset[str]:
+        return frozenset(InterestKeywordBuilder.normalize(str(keyword)) for keyword in keywords)
+
+    # 공유 캐시 key
+    def _shared_set_key(self, key: frozenset[str]) -> str:
+        text = json.dumps(sorted(key), ensure_ascii=False)
+        return f"keyword-set:{self.name}:" + hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+    def _shared_keyword_key(self, normalized: str) -> str:
+        return f"keyword-group:{self.name}:{normalized}"
+
+    # ---- 키워드 집합 단위 ----
+    def _store_set(self, key: frozenset[str], entry: dict):
+        self.sets[key] = entry
+        for normalized in key:
+            self.set_index[normalized].add(key)
+
+    def _evict_set(self, key: frozenset[str]):
+        for normalized in key:
+            bucket = self.set_index.get(normalized)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self.set_index[normalized]
+
+    # 정확히 일치하는 집합의 결과 (워커 내부 -> 공유 캐시 순)
+    async def get_result(self, keywords: list[str]):
+        key = self.set_key(keywords)
+        entry = self.sets.get(key)
+        if entry is None and self.name:
+            entry = await SharedCache.get(self._shared_set_key(key))
+            if entry is not None:
+                self._store_set(key, entry)
+        return copy.deepcopy(entry["result"]) if entry is not None else None
+
+    # assignments: 이 결과를 만들 때 사용한 키워드 -> 그룹 할당 (비슷한 집합 요청에서 재사용)
+    async def put_result(self, keywords: list[str], result, assignments: dict[str, str]):
+        key = self.set_key(keywords)
+        normalized_assignments = {}
+        for keyword, label in assignments.items():
+            normalized = InterestKeywordBuilder.normalize(str(keyword))
+            if normalized in key:
+                normalized_assignments[normalized] = label
+        entry = {"result": copy.deepcopy(result), "assignments": normalized_assignments}
+        self._store_set(key, entry)
+        if self.name:
+            await SharedCache.set(self._shared_set_key(key), entry, self.SHARED_TTL)
+
+    # 가장 비슷한 이전 집합의 키워드 할당 (정규화 키워드 -> 그룹)
+    def similar_assignments(self, keywords: list[str]) -> dict[str, str]:
+        key = self.set_key(keywords)
+        shared_counts: Counter[frozenset[str]] = Counter()
+        for normalized in key:
+            for other in self.set_index.get(normalized, ()):
+                shared_counts[other] += 1
+
+        best, best_score = None, 0.0
+        for other, shared in sorted(shared_counts.items(), key=lambda item: sorted(item[0])):
+            score = shared / (len(key) + len(other) - shared)  # Jaccard
+            if score >= self.set_threshold and score > best_score:
+                best, best_score = other, score
+        return dict(self.sets[best]["assignments"]) if best is not None else {}
+
+    # ---- 키워드 단위 ----
+    # 키워드 -> 그룹 할당 저장
+    def add(self, keyword: str, label: str):
+        normalized = InterestKeywordBuilder.normalize(str(keyword))
+        if not normalized:
+            return
+        if normalized not in self.assignments and len(self.assignments) >= self.max_keywords:
+            self._evict(next(iter(self.assignments)))  # 가장 오래된 키워드 제거
+
+        self.assignments[normalized] = label
+        grams = InterestKeywordBuilder.ngrams(normalized)
+        self.keyword_ngrams[normalized] = grams
+        for gram in grams:
+            self.ngram_index[gram].add(normalized)
+
+    # GPT 로 새로 분류한 키워드 저장 (공유 캐시에도 저장)
+    async def learn(self, assignments: dict[str, str]):
+        shared = {}
+        for keyword, label in assignments.items():
+            self.add(keyword, label)
+            normalized = InterestKeywordBuilder.normalize(str(keyword))
+            if normalized:
+                shared[self._shared_keyword_key(normalized)] = label
+        if self.name:
+            await SharedCache.set_many(shared, self.SHARED_TTL)
+
+    def _evict(self, normalized: str):
+        self.assignments.pop(normalized, None)
+        for gram in self.keyword_ngrams.pop(normalized, frozenset()):
+            bucket = self.ngram_index.get(gram)
+            if bucket is not None:
+                bucket.discard(normalized)
+                if not bucket:
+                    del self.ngram_index[gram]
+
+    # 단일 키워드 조회 (정확히 일치 -> n-gram 유사도 순)
+    def lookup(self, keyword: str) -> str | None:
+        normalized = InterestKeywordBuilder.normalize(str(keyword))
+        if normalized in self.assignments:
+            return self.assignments[normalized]
+
+        grams = InterestKeywordBuilder.ngrams(normalized)
+        candidates = set()
+        for gram in grams:
+            candidates.update(self.ngram_index.get(gram, ()))
+
+        best, best_score = None, 0.0
+        for candidate in sorted(candidates):
+            score = InterestKeywordBuilder.similarity(grams, self.keyword_ngrams[candidate])
+            if score >= self.threshold and score > best_score:
+                best, best_score = candidate, score
+        return self.assignments[best] if best is not None else None
+
+    # 키워드 리스트를 (로컬 할당 결과, GPT로 보낼 나머지)로 분리
+    # 비슷한 집합의 할당 -> 워커 내부 키워드 할당 -> 공유 캐시 키워드 할당 순으로 조회
+    async def assign(self, keywords: list[str]) -> tuple[dict[str, str], list[str]]:
+        similar = self.similar_assignments(keywords)
+        known: dict[str, str] = {}
+        unseen: list[str] = []
+        for keyword in keywords:
+            label = similar.get(InterestKeywordBuilder.normalize(str(keyword))) or self.lookup(keyword)
+            if label is None:
+                if keyword not in unseen:
+                    unseen.append(keyword)
+            else:
+                known[keyword] = label
+
+        if unseen and self.name:
+            keys = {keyword: self._shared_keyword_key(InterestKeywordBuilder.normalize(str(keyword)))
+                    for keyword in unseen}
+            shared = await SharedCache.get_many(list(keys.values()))
+            for keyword, key in keys.items():
+                if key in shared:
+                    known[keyword] = shared[key]
+                    self.add(keyword, shared[key])
+            unseen = [keyword for keyword in unseen if keyword not in known]
+        return known, unseen
+
+    def labels(self) -> set[str]:
+        return set(self.assignments.values())
@@ -3,10 +3,13 @@ import pprint
 from typing import List
 
 from googleapiclient.model import Model
-from openai import OpenAI
+from openai import AsyncOpenAI
 from pydantic import BaseModel
 
+from common.limiter.AdaptiveLimiter import AdaptiveLimiter
+from common.replay.UpstreamRecorder import UpstreamRecorder
 from domain.DTO.DTO import KeywordDTO
+from domain.service.KeywordGroupCache import KeywordGroupCache
 
 
 class MergeKeywordsDTO(BaseModel):
@@ -15,11 +18,14 @@ class MergeKeywordsDTO(BaseModel):
 
 
 class MargeKeywords:
-    client = OpenAI()
+    client = AsyncOpenAI()
+    shopping_cache = KeywordGroupCache("shopping")  # 키워드 -> 대표 키워드 (워커 간 공유)
+    place_cache = KeywordGroupCache("place")  # 키워드 -> location / category (워커 간 공유)
+    gpt_limiter = AdaptiveLimiter("keyword-processing", target_latency=8.0)  # 캐시로 처리 못한 GPT 요청만 제한
 
     @staticmethod
     def print_total_tokens(msg=None, response=None):
-        users = response.model_dump().get("usage")
+        users = response.get("usage")
         print(f"{msg} -> total_token : {users.get('total_tokens')}")
 
     @staticmethod
@@ -71,6 +77,43 @@ Output Format:
 }
 """
 
+    @staticmethod
+    def build_known_representatives_prompt(representatives: set[str]) -> str:
+        return f"""
+Existing representative keywords:
+{sorted(representatives)}
+- Reuse one of these as the representative when a keyword fits it.
+"""
+
+    @staticmethod
+    def merge_shopping_groups(known: dict[str, str], data: list) -> list:
+        # 대표 키워드 기준으로 로컬 할당 결과와 GPT 결과를 합침
+        groups: dict[str, list[str]] = {}
+        for keyword, representative in known.items():
+            options = groups.setdefault(representative, [])
+            if keyword != representative and keyword not in options:
+                options.append(keyword)
+        for group in data:
+            representative = group.get("keyword")
+            if not representative:  # 대표 키워드가 없는 그룹은 캐시 저장과 동일하게 제외
+                continue
+            options = groups.setdefault(representative, [])
+            for option in group.get("options") or []:
+                if option not in options:
+                    options.append(option)
+        return [{"keyword": keyword, "options": options} for keyword, options in groups.items()]
+
+    @staticmethod
+    def merge_place_groups(known: dict[str, str], data: dict) -> dict:
+        merged = {"location": [], "category": []}
+        for keyword, kind in known.items():
+            merged[kind].append(keyword)
+        for kind in merged:
+            for keyword in data.get(kind, []):
+                if keyword not in merged[kind]:
+                    merged[kind].append(keyword)
+        return merged
+
     @staticmethod
     def convert_place_keywords_to_result(data: dict) -> list:
         location_list = data.get("location", [])
@@ -78,9 +121,17 @@ Output Format:
         return [{"keyword": location, "options": category_list} for location in location_list]
 
     async def _send_to_gpt(self, dto: MergeKeywordsDTO):
+        async with self.gpt_limiter.acquire():
+            return await self._request_gpt(dto)
+
+    async def _create_response(self, request: dict) -> dict:
+        response = await self.client.responses.create(**request)
+        return response.model_dump()
+
+    async def _request_gpt(self, dto: MergeKeywordsDTO):
         # DTO 리스트를 JSON 문자열로 변환
         text = dto.keywords.__str__()
-        response = self.client.responses.create(
+        request = dict(
             model="gpt-4.1",
             input=[
                 {
@@ -96,24 +147,65 @@ Output Format:
             top_p=1,
             store=True
         )
+        response = await UpstreamRecorder.call("openai", request, lambda: self._create_response(request))
         self.print_total_tokens("키워드 점수", response)
         pprint.pprint(response)
-        keyword = json.loads(response.model_dump()["output"][0]["content"][0]["text"])
+        keyword = json.loads(response["output"][0]["content"][0]["text"])
 
         return keyword
 
     @classmethod
     async def get_shopping_keywords(cls, keywords: List[str]):
         print(keywords)
-
-        prompt = cls.build_shopping_prompt()
-        dto = MergeKeywordsDTO(prompt=prompt, keywords=keywords)
-        return await cls()._send_to_gpt(dto)
+        cached = await cls.shopping_cache.get_result(keywords)
+        if cached is not None:
+            return cached
+
+        # 이미 분류된 키워드는 로컬에서 할당하고 나머지만 GPT로 전달
+        known, unseen = await cls.shopping_cache.assign(keywords)
+        data = []
+        learned: dict[str, str] = {}
+        if unseen:
+            prompt = cls.build_shopping_prompt()
+            representatives = set(known.values())
+            if representatives:
+                prompt += cls.build_known_representatives_prompt(representatives)
+            dto = MergeKeywordsDTO(prompt=prompt, keywords=unseen)
+            data = await cls()._send_to_gpt(dto)
+            for group in data:
+                representative = group.get("keyword")
+                if not representative:
+                    continue
+                learned[representative] = representative
+                for option in group.get("options") or []:
+                    learned[option] = representative
+            await cls.shopping_cache.learn(learned)
+        print(f"키워드 캐시 -> local : {len(known)}, gpt : {len(unseen)}")
+
+        result = cls.merge_shopping_groups(known, data)
+        await cls.shopping_cache.put_result(keywords, result, {**learned, **known})
+        return result
 
     @classmethod
     async def get_place_keywords(cls, keywords: List[str]):
         print(keywords)
-        prompt = cls.build_place_prompt()
-        dto = MergeKeywordsDTO(prompt=prompt, keywords=keywords)
-        data = await cls()._send_to_gpt(dto)
-        return cls.convert_place_keywords_to_result(data)
+        cached = await cls.place_cache.get_result(keywords)
+        if cached is not None:
+            return cached
+
+        known, unseen = await cls.place_cache.assign(keywords)
+        data = {}
+        learned: dict[str, str] = {}
+        if unseen:
+            prompt = cls.build_place_prompt()
+            dto = MergeKeywordsDTO(prompt=prompt, keywords=unseen)
+            data = await cls()._send_to_gpt(dto)
+            for kind in ("location", "category"):
+                for keyword in data.get(kind, []):
+                    learned[keyword] = kind
+            await cls.place_cache.learn(learned)
+        print(f"키워드 캐시 -> local : {len(known)}, gpt : {len(unseen)}")
+
+        result = cls.convert_place_keywords_to_result(cls.merge_place_groups(known, data))
+        await cls.place_cache.put_result(keywords, result, {**learned, **known})
+        return result
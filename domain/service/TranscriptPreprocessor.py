@@ -0,0 +1,107 @@
+import re
+from bisect import bisect_left, bisect_right
+
+
+class TranscriptPreprocessor:
+    # 자막 스니펫을 요약 프롬프트용 텍스트로 정리
+    TOKEN_BUDGET = 1500  # 요약 입력 최대 토큰 수 (추정치)
+    DEDUPE_WINDOW = 3  # 자동 자막의 반복 줄을 찾기 위해 비교할 이전 줄 수
+    MIN_OVERLAP = 8  # 롤링 자막 겹침으로 판단할 최소 글자 수 (짧은 줄이 우연히 겹쳐 지워지지 않도록)
+
+    # 미리 컴파일한 정규화 규칙 (단어 경계는 유지)
+    _ANNOTATION = re.compile(r"\[[^\]]*\]|\([^)]*\)")  # [음악], (박수) 같은 자막 주석
+    _REPEATED_PUNCT = re.compile(r"([!?.~])\1+")
+    _WHITESPACE = re.compile(r"\s+")
+    # 로컬 토큰 추정: 한글 2글자, 영문 4글자, 숫자 3자리, 기호 1개를 각각 1토큰으로 계산
+    _TOKEN = re.compile(r"[가-힣]{1,2}|[A-Za-z]{1,4}|\d{1,3}|[^\sA-Za-z\d가-힣]")
+
+    # 시작/끝 시간 안의 스니펫만 선택 (스니펫은 start 기준 정렬되어 있음)
+    @staticmethod
+    def slice_by_time(snippets: list, start_time: float, end_time: float) -> list:
+        lo = bisect_left(snippets, start_time, key=lambda snippet: snippet.start)
+        hi = bisect_right(snippets, end_time, lo=lo, key=lambda snippet: snippet.start)
+        return snippets[lo:hi]
+
+    @classmethod
+    def normalize(cls, text: str) -> str:
+        text = cls._ANNOTATION.sub(" ", text)
+        text = cls._REPEATED_PUNCT.sub(r"\1", text)
+        return cls._WHITESPACE.sub(" ", text).strip()
+
+    # 이전 줄 끝과 현재 줄 앞이 겹치는 글자 수 (롤링 자막), MIN_OVERLAP 미만이면 0
+    @classmethod
+    def overlap(cls, previous: str, line: str) -> int:
+        for size in range(min(len(previous), len(line)), cls.MIN_OVERLAP - 1, -1):
+            if previous.endswith(line[:size]):
+                return size
+        return 0
+
+    # 자동 자막에서 반복되는 줄 제거
+    # - 최근 줄과 완전히 같은 줄은 제거
+    # - 이전 줄이 이어져서 다시 나온 경우(이전 줄로 시작) 이전 줄을 교체
+    # - 이전 줄 끝부분이 반복된 경우(롤링 자막) 겹친 부분만 제거
+    @classmethod
+    def dedupe(cls, lines: list[str]) -> list[str]:
+        result: list[str] = []
+        for line in lines:
+            if not line or line in result[-cls.DEDUPE_WINDOW:]:
+                continue
+            if result:
+                previous = result[-1]
+                if len(previous) >= cls.MIN_OVERLAP and line.startswith(previous):
+                    result[-1] = line
+                    continue
+                if len(line) >= cls.MIN_OVERLAP and previous.startswith(line):
+                    continue
+                size = cls.overlap(previous, line)
+                if size:
+                    line = line[size:].strip()
+                    if not line:
+                        continue
+            result.append(line)
+        return result
+
+    @classmethod
+    def count_tokens(cls, text: str) -> int:
+        return len(cls._TOKEN.findall(text))
+
+    # 토큰 수가 max_tokens 를 넘으면 뒷부분을 자름
+    @classmethod
+    def truncate(cls, line: str, max_tokens: int) -> str:
+        if max_tokens <= 0:
+            return ""
+        for index, match in enumerate(cls._TOKEN.finditer(line)):
+            if index == max_tokens - 1:
+                return line[:match.end()]
+        return line
+
+    # 토큰 예산에 맞게 줄을 고르게 추려 영상 전체 내용을 유지
+    @classmethod
+    def trim_to_budget(cls, lines: list[str], token_budget: int) -> list[str]:
+        lines = [cls.truncate(line, token_budget - 1) for line in lines]  # 예산보다 큰 줄은 잘라서 유지
+        counts = [cls.count_tokens(line) + 1 for line in lines]  # 줄 사이 공백 포함
+        total = sum(counts)
+        if total <= token_budget:
+            return lines
+
+        ratio = token_budget / total
+        credit = 0.0
+        used = 0
+        result = []
+        for line, count in zip(lines, counts):
+            credit += count * ratio
+            if credit >= count and used + count <= token_budget:
+                result.append(line)
+                credit -= count
+                used += count
+        if not result and lines:  # 줄이 예산에 비해 커서 하나도 선택되지 않은 경우 첫 줄 사용
+            result.append(lines[0])
+        return result
+
+    @classmethod
+    def preprocess(cls, snippets: list, start_time: float, end_time: float,
+                   token_budget: int = TOKEN_BUDGET) -> str:
+        window = cls.slice_by_time(snippets, start_time, end_time)
+        lines = cls.dedupe([cls.normalize(snippet.text) for snippet in window])
+        lines = cls.trim_to_budget(lines, token_budget)
+        return " ".join(lines)
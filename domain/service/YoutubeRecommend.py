@@ -1,15 +1,20 @@
+import asyncio
 import os
 import re
+import threading
 import traceback
 from pprint import pprint
 from itertools import islice
 from fastapi.exceptions import RequestValidationError
-from youtube_transcript_api import YouTubeTranscriptApi, NoTranscriptFound
+from youtube_transcript_api import YouTubeTranscriptApi, NoTranscriptFound, FetchedTranscriptSnippet
 from googleapiclient.discovery import build
+from googleapiclient.http import build_http
 from youtube_transcript_api.proxies import WebshareProxyConfig
 
 from common.config.environment import *
+from common.replay.UpstreamRecorder import UpstreamRecorder
 from domain.DTO.VideoInfoDTO import VideoInfoDTO
+from domain.service.TranscriptPreprocessor import TranscriptPreprocessor
 from domain.service.YoutubeSummary import YoutubeSummary
 
 
@@ -21,6 +26,7 @@ class YoutubeRecommend:
     MIN_VIDEO_LENGTH = 90  # 최소 영상 길이 (sec)
 
     youtube = build("youtube", "v3", developerKey=YOUTUBE_API_KEY)  # youtube api 설정
+    _local = threading.local()  # httplib2.Http 는 스레드 간 공유가 안 되므로 스레드마다 생성 (build_http: 기본 timeout 60초)
     ytt_api = YouTubeTranscriptApi(  # youtube proxy 설정
         proxy_config=WebshareProxyConfig(
             proxy_username=PROXY_USERNAME,
@@ -28,6 +34,18 @@ class YoutubeRecommend:
         )
     )
 
+    # 동기 API 요청을 스레드에서 실행 (이벤트 루프를 막지 않음)
+    @classmethod
+    def _execute_sync(cls, request) -> dict:
+        http = getattr(cls._local, "http", None)
+        if http is None:
+            http = cls._local.http = build_http()
+        return request.execute(http=http)
+
+    @classmethod
+    async def execute(cls, request) -> dict:
+        return await asyncio.to_thread(cls._execute_sync, request)
+
     # 시간 정규화
     @staticmethod
     async def format_duration(duration: str) -> tuple[str, int]:
@@ -52,12 +70,14 @@ class YoutubeRecommend:
         if not query:
             raise RequestValidationError("query is required")
         try:
-            response = cls.youtube.search().list(
+            request = dict(
                 q=query,
                 part="id",
                 maxResults=max_results,
                 type="video"
-            ).execute()
+            )
+            response = await UpstreamRecorder.call("youtube.search", request,
+                                                   lambda: cls.execute(cls.youtube.search().list(**request)))
             return [item["id"]["videoId"] for item in response.get("items", [])]
         except Exception:
             raise Exception("YouTube API token limit exceeded")
@@ -67,15 +87,10 @@ class YoutubeRecommend:
     async def get_video_subtitles(cls, video_details: VideoInfoDTO) -> str:
         video_id = video_details.id
         try:
-            transcript_list = cls.ytt_api.list(video_id)
-            try:
-                transcript = transcript_list.find_manually_created_transcript(['ko'])  # 이미 작성된 자막 있는지 확인
-            except NoTranscriptFound:
-                transcript = transcript_list.find_generated_transcript(['ko'])
-            fetched_snippets = transcript.fetch().snippets
-            filtered_snippets = [s for s in fetched_snippets if cls.START_TIME <= s.start <= cls.END_TIME]
-            normalized = [re.sub(r'\s+', '', snippet.text) for snippet in filtered_snippets]
-            return " ".join(normalized).strip()
+            snippets = await UpstreamRecorder.call("youtube.transcript", {"video_id": video_id},
+                                                   lambda: asyncio.to_thread(cls.fetch_transcript, video_id))
+            fetched_snippets = [FetchedTranscriptSnippet(**snippet) for snippet in snippets]
+            return TranscriptPreprocessor.preprocess(fetched_snippets, cls.START_TIME, cls.END_TIME)
 
         except Exception as e:
             print("Error: 예외 발생")
@@ -84,6 +99,19 @@ class YoutubeRecommend:
             traceback.print_exc()
             return None
 
+    # 자막 조회 (record/replay 를 위해 dict 리스트로 반환)
+    @classmethod
+    def fetch_transcript(cls, video_id: str) -> list[dict]:
+        transcript_list = cls.ytt_api.list(video_id)
+        try:
+            transcript = transcript_list.find_manually_created_transcript(['ko'])  # 이미 작성된 자막 있는지 확인
+        except NoTranscriptFound:
+            transcript = transcript_list.find_generated_transcript(['ko'])
+        return [
+            {"text": snippet.text, "start": snippet.start, "duration": snippet.duration}
+            for snippet in transcript.fetch().snippets
+        ]
+
     # 유튜브 설명 추출
     @classmethod
     async def get_video_description(cls, video_details: VideoInfoDTO) -> str:
@@ -93,7 +121,7 @@ class YoutubeRecommend:
         description = video_details.description
         subtitles = await cls.get_video_subtitles(video_details)  # 생성 자막 추출
 
-        if subtitles or subtitles.strip():  # 자막이 없으면 설명란으로 대체
+        if subtitles and subtitles.strip():  # 자막이 없으면 설명란으로 대체
             return await YoutubeSummary.create_summary(subtitles)  # 생성 자막 요약
         else:
             return await YoutubeSummary.create_summary(description)  # 기존 자막 요약
@@ -104,10 +132,12 @@ class YoutubeRecommend:
         if not video_ids:
             raise RequestValidationError("video_ids is required")
 
-        response = cls.youtube.videos().list(
+        request = dict(
             part="snippet,contentDetails",
             id=",".join(video_ids)
-        ).execute()
+        )
+        response = await UpstreamRecorder.call("youtube.videos", request,
+                                               lambda: cls.execute(cls.youtube.videos().list(**request)))
 
         try:
             video_info_list = []
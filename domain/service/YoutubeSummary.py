@@ -1,15 +1,38 @@
 import json
-from openai import OpenAI
+from openai import AsyncOpenAI
+
+from common.limiter.AdaptiveLimiter import AdaptiveLimiter
+from common.replay.UpstreamRecorder import UpstreamRecorder
+
+
+class SummaryUpstreamError(Exception):
+    # OpenAI 호출 실패로 요약하지 못한 경우 (limiter 가 실패로 집계하도록 원인 예외를 연결해서 발생)
+    pass
 
 
 class YoutubeSummary:
-    client = OpenAI()
+    client = AsyncOpenAI()  # 호출 중에도 이벤트 루프가 다른 요청을 처리하도록 비동기 클라이언트 사용
+
+    PROMPT_VERSION = "1"  # 프롬프트 변경 시 올려서 캐시/ETag 무효화
+
+    NO_DESCRIPTION_MESSAGE = "설명과 자막이 모두 제공되지 않았습니다."
+    SUMMARY_ERROR_MESSAGE = "자막 생성 에러"
 
     @staticmethod
     def print_total_tokens(msg=None, response=None):
-        users = response.model_dump().get("usage")
+        users = response.get("usage")
         print(f"{msg} -> total_token : {users.get('total_tokens')}")
 
+    # OpenAI 호출 (record/replay 지원, 응답은 dict)
+    @classmethod
+    async def create_response(cls, request: dict) -> dict:
+        return await UpstreamRecorder.call("openai", request, lambda: cls._create_response(request))
+
+    @classmethod
+    async def _create_response(cls, request: dict) -> dict:
+        response = await cls.client.responses.create(**request)
+        return response.model_dump()
+
     # 관심사 추출
     @classmethod
     async def create_interest_keyword(cls, interest_scores, max_search_keyword: int = 5):
@@ -22,7 +45,7 @@ class YoutubeSummary:
                 """
         text = interest_scores
 
-        response = cls.client.responses.create(
+        request = dict(
             model="gpt-4.1",
             input=[
                 {
@@ -63,8 +86,9 @@ class YoutubeSummary:
             top_p=1,
             store=True
         )
+        response = await cls.create_response(request)
         cls.print_total_tokens("유튜브 검색 키워드", response)
-        keyword = json.loads(response.model_dump()["output"][0]["content"][0]["text"])
+        keyword = json.loads(response["output"][0]["content"][0]["text"])
         # print(keyword)
         return keyword.get("keywords")[:max_search_keyword]
 
@@ -72,7 +96,7 @@ class YoutubeSummary:
     @classmethod
     async def create_summary(cls, description: str):
         if description is None or len(description) < 30:
-            return "설명과 자막이 모두 제공되지 않았습니다."
+            return cls.NO_DESCRIPTION_MESSAGE
         try:
             prompt_1 = f"""
                         The text received is the text to be summarized. 
@@ -86,7 +110,7 @@ class YoutubeSummary:
                         If the text is not in Korean, translate it to Korean anyway.
                         """
 
-            response = cls.client.responses.create(
+            request = dict(
                 model="gpt-4.1-mini-2025-04-14",
                 input=[
                     {
@@ -107,11 +131,14 @@ class YoutubeSummary:
                 top_p=1,
                 store=True
             )
+            response = await cls.create_response(request)
 
             cls.print_total_tokens("요약", response)
-            # pprint(response.model_dump())
-            text = response.model_dump()["output"][0]["content"][0]["text"]
+            # pprint(response)
+            text = response["output"][0]["content"][0]["text"]
             return text.strip()
         except Exception as e:
             print(e)
-            return "자막 생성 에러"
+            if AdaptiveLimiter.is_upstream_error(e):  # 429/5xx/timeout 은 호출한 쪽에서 에러 메시지로 변환
+                raise SummaryUpstreamError(str(e)) from e
+            return cls.SUMMARY_ERROR_MESSAGE
@@ -1,4 +1,5 @@
 import random
+from contextlib import asynccontextmanager
 from pprint import pprint
 import asyncio
 
@@ -8,7 +9,11 @@ from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
 import httpx
 from typing import Tuple, List, Dict
+from common.cache.SharedCache import SharedCache
 from common.config.environment import *
+from common.profiling.RequestProfiler import init_request_profiler
+from common.replay.UpstreamRecorder import UpstreamRecorder
+from common.response.FastJSONResponse import FastJSONResponse
 from domain.controller.KeywordProcessing import init_KeywordProcessing_controller
 from domain.controller.YouTubeVideoRecommend import init_YouTubeVideoRecommend_controller
 from common.exceptionHandler.Handlers import init_exception_handler
@@ -16,11 +21,25 @@ from common.exceptionHandler.Handlers import init_exception_handler
 # OpenAI API key 설정
 openai.api_key = 'your-openai-api-key'
 
+
+# 앱 수명주기 동안 재사용할 클라이언트 (워커마다 하나씩 생성)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.http_client = httpx.AsyncClient(timeout=10.0)
+    SharedCache.open()
+    purge_task = asyncio.create_task(SharedCache.purge_periodically())  # 만료 캐시 정리
+    yield
+    purge_task.cancel()
+    await app.state.http_client.aclose()
+    SharedCache.close()
+
+
 # FastAPI 앱 초기화
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 init_YouTubeVideoRecommend_controller(app)
 init_exception_handler(app)
 init_KeywordProcessing_controller(app)
+init_request_profiler(app)
 
 
 # 데이터 모델 정의
@@ -87,10 +106,20 @@ async def analyze_user_data(user_data: UserData):
     pprint(naver_results)
     pprint(naver_places)
 
-    return {
+    # 기본 encoder(jsonable_encoder)를 거치지 않고 바로 직렬화
+    return FastJSONResponse(content={
         "user_id": user_data.user_id,
         "naver_results": naver_results,
         "naver_places": naver_places
+    })
+
+
+async def naver_get(client: httpx.AsyncClient, url: str, headers: Dict, params: Dict) -> Dict:
+    """네이버 API GET 호출 (record/replay 를 위해 상태 코드와 본문만 반환)"""
+    response = await client.get(url, headers=headers, params=params)
+    return {
+        "status_code": response.status_code,
+        "json": response.json() if response.status_code == 200 else None
     }
 
 
@@ -105,18 +134,19 @@ async def naver_shopping_search(query: str, options: List[str]):
     results = []
     search_targets = options if options else [""]
 
-    async with httpx.AsyncClient() as client:
-        for option in search_targets:
-            query_with_option = option if option else query
-            params = {"query": query_with_option, "display": 4, "sort": "sim"}
+    client: httpx.AsyncClient = app.state.http_client
+    for option in search_targets:
+        query_with_option = option if option else query
+        params = {"query": query_with_option, "display": 4, "sort": "sim"}
 
-            response = await client.get(url, headers=headers, params=params)
-            if response.status_code != 200:
-                continue
+        response = await UpstreamRecorder.call("naver.shopping", params,
+                                               lambda: naver_get(client, url, headers, params))
+        if response["status_code"] != 200:
+            continue
 
-            data = response.json()
-            items = data.get("items", [])
-            results.extend(items)
+        data = response["json"]
+        items = data.get("items", [])
+        results.extend(items)
 
     return results
 
@@ -129,33 +159,37 @@ async def naver_places_search(query: str, options: List[str]):
         "X-Naver-Client-Secret": NAVER_CLIENT_SECRET
     }
 
-    # 옵션 중 하나를 랜덤으로 선택
-    random_option = random.choice(options) if options else ""
-
-    # query와 붙이기
-    query_with_random_option = f"{query} {random_option}"
-    params = {"query": query_with_random_option, "display": 4, "sort": "random"}
-    print("query_with_random_option" + query_with_random_option)
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, headers=headers, params=params)
-        if response.status_code != 200:
-            raise HTTPException(status_code=response.status_code, detail="네이버 지역 검색 API 호출 실패")
-
-        data = response.json()
-        places = data.get("items", [])
-
-        # 장소 정보 반환시 link가 없으면 네이버 지도 링크 추가
-        return [
-            {
-                "title": place["title"],
-                "address": place["address"],
-                "category": place["category"],
-                "lng": float(place['mapx']) / 1e7,
-                "lat": float(place['mapy']) / 1e7,
-                "link": generate_naver_map_link(place)
-            }
-            for place in places
-        ]
+    # 옵션 중 하나를 랜덤으로 선택해 query와 붙여서 검색
+    # (replay 를 위해 기록 key 는 랜덤 선택 전의 query/options 로 만들고, 선택은 기록되는 호출 안에서 수행)
+    request = {"query": query, "options": options, "display": 4, "sort": "random"}
+    client: httpx.AsyncClient = app.state.http_client
+
+    async def search_with_random_option():
+        random_option = random.choice(options) if options else ""
+        query_with_random_option = f"{query} {random_option}"
+        print("query_with_random_option" + query_with_random_option)
+        params = {"query": query_with_random_option, "display": 4, "sort": "random"}
+        return await naver_get(client, url, headers, params)
+
+    response = await UpstreamRecorder.call("naver.local", request, search_with_random_option)
+    if response["status_code"] != 200:
+        raise HTTPException(status_code=response["status_code"], detail="네이버 지역 검색 API 호출 실패")
+
+    data = response["json"]
+    places = data.get("items", [])
+
+    # 장소 정보 반환시 link가 없으면 네이버 지도 링크 추가
+    return [
+        {
+            "title": place["title"],
+            "address": place["address"],
+            "category": place["category"],
+            "lng": float(place['mapx']) / 1e7,
+            "lat": float(place['mapy']) / 1e7,
+            "link": generate_naver_map_link(place)
+        }
+        for place in places
+    ]
 
 
 from urllib.parse import quote  # URL 인코딩을 위해 필요
@@ -216,7 +250,22 @@ def analyze_intent_with_type(keywords: List[str]) -> Tuple[str, str]:
 
 
 # 실행 진입점
+# - development: 단일 프로세스 + reload
+# - production: 멀티 워커 + uvloop/httptools (앱 코드는 이 프로세스에서 먼저 import 되어 설정 오류를 미리 확인)
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000, reload=True)
+    if APP_ENV == "production":
+        uvicorn.run(
+            "main:app",
+            host=SERVER_HOST,
+            port=SERVER_PORT,
+            workers=SERVER_WORKERS,
+            loop="uvloop",
+            http="httptools",
+            lifespan="on",
+            proxy_headers=True,
+            access_log=SERVER_ACCESS_LOG,
+        )
+    else:
+        uvicorn.run("main:app", host=SERVER_HOST, port=SERVER_PORT, reload=True)
 
 # TEST
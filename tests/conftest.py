@@ -0,0 +1,5 @@
+import os
+
+# 서비스 모듈이 import 시점에 API 클라이언트를 만들기 때문에 테스트용 값 설정 (실제 호출은 하지 않음)
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("YOUTUBE_API_KEY", "test")
@@ -0,0 +1,67 @@
+import asyncio
+
+import httpx
+import pytest
+
+from common.limiter.AdaptiveLimiter import AdaptiveLimiter, OverloadedError
+
+
+async def run_job(limiter: AdaptiveLimiter, delay: float) -> str:
+    try:
+        async with limiter.acquire():
+            await asyncio.sleep(delay)
+        return "ok"
+    except OverloadedError:
+        return "shed"
+
+
+def test_sheds_requests_above_limit():
+    limiter = AdaptiveLimiter("test", target_latency=1.0, initial_limit=4)
+
+    async def main():
+        return await asyncio.gather(*[run_job(limiter, 0.05) for _ in range(50)])
+
+    results = asyncio.run(main())
+
+    assert results.count("ok") == 4
+    assert results.count("shed") == 46
+    assert limiter.in_flight == 0
+
+
+def test_slow_upstream_shrinks_limit():
+    limiter = AdaptiveLimiter("test", target_latency=0.01, initial_limit=8)
+
+    asyncio.run(run_job(limiter, 0.05))
+
+    assert limiter.limit < 8
+
+
+def test_upstream_error_shrinks_limit():
+    limiter = AdaptiveLimiter("test", target_latency=1.0, initial_limit=8)
+
+    async def main():
+        async with limiter.acquire():
+            try:
+                raise httpx.ConnectError("down")
+            except httpx.ConnectError:
+                raise Exception("YouTube API token limit exceeded")  # 서비스 코드처럼 감싼 예외
+
+    with pytest.raises(Exception):
+        asyncio.run(main())
+
+    assert limiter.limit < 8
+    assert limiter.in_flight == 0
+
+
+def test_client_error_does_not_change_limit():
+    limiter = AdaptiveLimiter("test", target_latency=1.0, initial_limit=8)
+
+    async def main():
+        async with limiter.acquire():
+            [].pop()
+
+    with pytest.raises(IndexError):
+        asyncio.run(main())
+
+    assert limiter.limit == 8
+    assert limiter.in_flight == 0
@@ -0,0 +1,32 @@
+from common.response.HttpCache import NO_STORE, cache_headers, is_not_modified, make_etag, not_modified_response
+
+
+def test_make_etag_is_weak_and_depends_on_every_part():
+    etag = make_etag("1", b'{"description":"a"}')
+
+    assert etag.startswith('W/"') and etag.endswith('"')
+    assert etag == make_etag("1", b'{"description":"a"}')
+    assert etag != make_etag("2", b'{"description":"a"}')
+    assert etag != make_etag("1", b'{"description":"b"}')
+
+
+def test_is_not_modified_uses_weak_comparison():
+    etag = make_etag("1", b"data")
+    opaque = etag.removeprefix("W/")
+
+    assert is_not_modified(etag, etag)
+    assert is_not_modified(opaque, etag)  # 프록시가 W/ 를 제거한 경우
+    assert is_not_modified(f'"other", {etag}', etag)
+    assert is_not_modified("*", etag)
+    assert not is_not_modified('W/"other"', etag)
+    assert not is_not_modified(None, etag)
+    assert not is_not_modified("", etag)
+
+
+def test_not_modified_response_has_no_body():
+    response = not_modified_response('W/"abc"', NO_STORE)
+
+    assert response.status_code == 304
+    assert response.body == b""
+    assert response.headers["etag"] == 'W/"abc"'
+    assert cache_headers('W/"abc"', NO_STORE) == {"ETag": 'W/"abc"', "Cache-Control": NO_STORE}
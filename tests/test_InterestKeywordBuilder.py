@@ -0,0 +1,45 @@
+import random
+
+from domain.service.InterestKeywordBuilder import InterestKeywordBuilder
+
+
+def test_same_scores_give_same_keywords_regardless_of_order():
+    scores = {"캠핑 의자": 10, "러닝화": 8, "나이키 러닝화": 7, "캠핑": 3, "커피": 8, "제주도": 8}
+    expected = InterestKeywordBuilder.create_interest_keyword(scores, 5)
+
+    items = list(scores.items())
+    for seed in range(5):
+        random.Random(seed).shuffle(items)
+        assert InterestKeywordBuilder.create_interest_keyword(dict(items), 5) == expected
+
+
+def test_near_duplicates_are_grouped():
+    scores = {"캠핑 의자": 10, "러닝화": 8, "나이키 러닝화": 7, "캠핑": 3}
+
+    groups = InterestKeywordBuilder.group_keywords(scores)
+
+    assert [(group["keyword"], group["score"]) for group in groups] == [("러닝화", 15), ("캠핑 의자", 13)]
+    assert groups[0]["members"] == ["러닝화", "나이키 러닝화"]
+    assert InterestKeywordBuilder.create_interest_keyword(scores, 5) == ["러닝화", "캠핑 의자"]
+
+
+def test_spacing_and_case_are_normalized():
+    scores = {"캠핑의자": 5, "캠핑  의자": 4, "Nike": 3, "nike": 3}
+
+    assert InterestKeywordBuilder.create_interest_keyword(scores, 5) == ["캠핑의자", "nike"]
+
+
+def test_unrelated_keywords_stay_separate():
+    scores = {"커피": 3, "제주도": 2, "노트북": 1}
+
+    assert InterestKeywordBuilder.create_interest_keyword(scores, 5) == ["커피", "제주도", "노트북"]
+
+
+def test_top_k_limit():
+    keywords = ["커피", "제주도", "노트북", "러닝화", "캠핑", "요가", "등산", "독서"]
+    scores = {keyword: 10 - i for i, keyword in enumerate(keywords)}
+
+    assert InterestKeywordBuilder.create_interest_keyword(scores, 3) == ["커피", "제주도", "노트북"]
+    assert len(InterestKeywordBuilder.create_interest_keyword(scores, 20)) == InterestKeywordBuilder.MAX_KEYWORDS
+    assert InterestKeywordBuilder.create_interest_keyword(scores, 0) == []
+    assert InterestKeywordBuilder.create_interest_keyword({}, 3) == []
@@ -0,0 +1,142 @@
+import asyncio
+
+import pytest
+
+from common.cache.SharedCache import SharedCache
+from domain.service.KeywordGroupCache import KeywordGroupCache
+from domain.service.MergeKeywords import MargeKeywords
+
+
+@pytest.fixture(autouse=True)
+def shared_cache(tmp_path):
+    SharedCache.close()
+    SharedCache.open(str(tmp_path / "cache.sqlite3"))
+    yield SharedCache
+    SharedCache.close()
+
+
+def test_lookup_exact_and_similar_keyword():
+    cache = KeywordGroupCache()
+    cache.add("캠핑 의자", "캠핑")
+
+    assert cache.lookup("캠핑의자") == "캠핑"  # 공백 차이는 정확히 일치
+    assert cache.lookup("캠핑 의자들") == "캠핑"  # n-gram 유사도
+    assert cache.lookup("의자") is None
+
+
+def test_assign_splits_known_and_unseen():
+    cache = KeywordGroupCache()
+    cache.add("텐트", "캠핑")
+
+    known, unseen = asyncio.run(cache.assign(["텐트", "러닝화", "러닝화"]))
+
+    assert known == {"텐트": "캠핑"}
+    assert unseen == ["러닝화"]
+
+
+def test_oldest_keyword_is_evicted():
+    cache = KeywordGroupCache(max_keywords=2)
+    for keyword in ("텐트", "러닝화", "노트북"):
+        cache.add(keyword, keyword)
+
+    assert cache.lookup("텐트") is None
+    assert cache.lookup("노트북") == "노트북"
+    assert all("텐트" not in bucket for bucket in cache.ngram_index.values())
+
+
+def test_exact_set_returns_copy_of_result():
+    cache = KeywordGroupCache()
+    result = [{"keyword": "캠핑", "options": ["텐트"]}]
+    asyncio.run(cache.put_result(["텐트", "캠핑"], result, {"텐트": "캠핑", "캠핑": "캠핑"}))
+
+    cached = asyncio.run(cache.get_result(["캠핑", "텐트 "]))
+    cached[0]["options"].append("변경")
+
+    assert asyncio.run(cache.get_result(["텐트", "캠핑"])) == result
+
+
+def test_similar_set_reuses_its_assignments():
+    cache = KeywordGroupCache()
+    asyncio.run(cache.put_result(["텐트", "랜턴", "버너", "러닝화"], [],
+                                 {"텐트": "캠핑", "랜턴": "캠핑", "버너": "캠핑", "러닝화": "운동"}))
+
+    # 키워드 단위 할당이 없어도 비슷한 집합(4/5)의 할당을 사용
+    known, unseen = asyncio.run(cache.assign(["텐트", "랜턴", "버너", "러닝화", "노트북"]))
+
+    assert known == {"텐트": "캠핑", "랜턴": "캠핑", "버너": "캠핑", "러닝화": "운동"}
+    assert unseen == ["노트북"]
+    assert cache.similar_assignments(["텐트", "노트북", "커피"]) == {}  # 1/6
+
+
+def test_evicted_set_is_removed_from_index():
+    cache = KeywordGroupCache(max_sets=1)
+    asyncio.run(cache.put_result(["텐트"], [], {"텐트": "캠핑"}))
+    asyncio.run(cache.put_result(["러닝화"], [], {"러닝화": "운동"}))
+
+    assert "텐트" not in cache.set_index
+    assert cache.similar_assignments(["텐트"]) == {}
+
+
+def test_named_caches_share_results_across_workers():
+    worker_a, worker_b = KeywordGroupCache("shopping"), KeywordGroupCache("shopping")
+    result = [{"keyword": "캠핑", "options": ["텐트"]}]
+
+    async def main():
+        await worker_a.learn({"텐트": "캠핑", "캠핑": "캠핑"})
+        await worker_a.put_result(["텐트"], result, {"텐트": "캠핑"})
+        return await worker_b.get_result(["텐트"]), await worker_b.assign(["캠핑", "러닝화"])
+
+    cached, (known, unseen) = asyncio.run(main())
+
+    assert cached == result
+    assert known == {"캠핑": "캠핑"}
+    assert unseen == ["러닝화"]
+    assert worker_b.lookup("캠핑") == "캠핑"
+
+
+def test_merge_shopping_groups():
+    known = {"텐트": "캠핑", "캠핑": "캠핑"}
+    data = [{"keyword": "캠핑", "options": ["랜턴", "텐트"]}, {"keyword": "운동", "options": ["러닝화"]},
+            {"options": ["대표 없음"]}]
+
+    assert MargeKeywords.merge_shopping_groups(known, data) == [
+        {"keyword": "캠핑", "options": ["텐트", "랜턴"]},
+        {"keyword": "운동", "options": ["러닝화"]},
+    ]
+
+
+def test_merge_place_groups():
+    known = {"성수동": "location", "카페": "category"}
+    data = {"location": ["강남역", "성수동"], "category": ["베이커리"]}
+
+    merged = MargeKeywords.merge_place_groups(known, data)
+
+    assert merged == {"location": ["성수동", "강남역"], "category": ["카페", "베이커리"]}
+    assert MargeKeywords.convert_place_keywords_to_result(merged) == [
+        {"keyword": "성수동", "options": ["카페", "베이커리"]},
+        {"keyword": "강남역", "options": ["카페", "베이커리"]},
+    ]
+
+
+def test_similar_request_only_sends_new_keywords_to_gpt(monkeypatch):
+    monkeypatch.setattr(MargeKeywords, "shopping_cache", KeywordGroupCache())
+    sent = []
+
+    async def send_to_gpt(self, dto):
+        sent.append(dto.keywords)
+        return [{"keyword": "캠핑", "options": [k for k in dto.keywords if k != "러닝화"]},
+                {"keyword": "운동", "options": ["러닝화"]} if "러닝화" in dto.keywords else {}]
+
+    monkeypatch.setattr(MargeKeywords, "_send_to_gpt", send_to_gpt)
+
+    async def main():
+        await MargeKeywords.get_shopping_keywords(["텐트", "랜턴", "버너", "러닝화"])
+        for keyword in list(MargeKeywords.shopping_cache.assignments):  # 키워드 단위 할당이 밀려난 상황
+            MargeKeywords.shopping_cache._evict(keyword)
+        return await MargeKeywords.get_shopping_keywords(["텐트", "랜턴", "버너", "러닝화", "코펠"])
+
+    result = asyncio.run(main())
+
+    assert sent == [["텐트", "랜턴", "버너", "러닝화"], ["코펠"]]
+    assert result == [{"keyword": "캠핑", "options": ["텐트", "랜턴", "버너", "코펠"]},
+                      {"keyword": "운동", "options": ["러닝화"]}]
@@ -0,0 +1,68 @@
+import json
+import os
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from common.profiling import RequestProfiler as profiling
+from common.profiling.RequestProfiler import RequestProfiler, init_request_profiler
+
+
+@pytest.fixture
+def profile_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILE_DIR", str(tmp_path))
+    monkeypatch.setattr(profiling, "PROFILE_TOKEN", "secret")
+    monkeypatch.setattr(RequestProfiler, "sample_rate", 0.0)
+    return tmp_path
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    init_request_profiler(app)
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    return TestClient(app)
+
+
+def test_disabled_profiler_passes_requests_through(client, profile_dir, monkeypatch):
+    monkeypatch.setattr(RequestProfiler, "enabled", False)
+
+    response = client.get("/ping", headers={"X-Profile": "secret"})
+
+    assert response.json() == {"ok": True}
+    assert "x-profile-id" not in response.headers
+    assert os.listdir(profile_dir) == []
+
+
+def test_token_request_is_profiled(client, profile_dir, monkeypatch):
+    monkeypatch.setattr(RequestProfiler, "enabled", True)
+
+    assert "x-profile-id" not in client.get("/ping", headers={"X-Profile": "wrong"}).headers
+    response = client.get("/ping", headers={"X-Profile": "secret"})
+
+    profile_id = response.headers["x-profile-id"]
+    with open(profile_dir / f"{profile_id}.json", encoding="utf-8") as f:
+        artifact = json.load(f)
+    assert response.json() == {"ok": True}
+    assert artifact["path"] == "/ping"
+    assert artifact["status_code"] == 200
+
+
+def test_save_keeps_only_latest_files(profile_dir, monkeypatch):
+    monkeypatch.setattr(RequestProfiler, "MAX_FILES", 3)
+    for i in range(5):
+        RequestProfiler.save(f"{i:032x}", {"id": i})
+        os.utime(profile_dir / f"{i:032x}.json", (i, i))
+
+    assert sorted(os.listdir(profile_dir)) == [f"{i:032x}.json" for i in (2, 3, 4)]
+
+
+def test_admin_api_requires_token(client, profile_dir):
+    assert client.get("/admin/profiling/profiles").status_code == 403
+    assert client.get("/admin/profiling/profiles", headers={"X-Admin-Token": "wrong"}).status_code == 403
+    assert client.get("/admin/profiling/profiles", headers={"X-Admin-Token": "secret"}).json() == []
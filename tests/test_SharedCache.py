@@ -0,0 +1,136 @@
+import asyncio
+
+import pytest
+
+from common.cache.SharedCache import SharedCache
+
+
+@pytest.fixture(autouse=True)
+def shared_cache(tmp_path, monkeypatch):
+    SharedCache.close()
+    SharedCache.open(str(tmp_path / "cache.sqlite3"))
+    monkeypatch.setattr(SharedCache, "POLL_INTERVAL", 0.01)
+    SharedCache._inflight.clear()
+    yield SharedCache
+    SharedCache.close()
+
+
+def test_concurrent_callers_share_one_computation():
+    calls = 0
+
+    async def factory():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return {"description": "요약"}
+
+    async def main():
+        return await asyncio.gather(*[SharedCache.get_or_create("k", 10, factory) for _ in range(10)])
+
+    results = asyncio.run(main())
+
+    assert calls == 1
+    assert results == [{"description": "요약"}] * 10
+    assert SharedCache.get_sync("k") == {"description": "요약"}
+
+
+def test_waits_for_other_worker_holding_lock():
+    calls = 0
+
+    async def factory():
+        nonlocal calls
+        calls += 1
+        return "mine"
+
+    async def other_worker():
+        await asyncio.sleep(0.05)
+        SharedCache.set_sync("k", "theirs", 10)
+        SharedCache._release_sync("k")
+
+    async def main():
+        assert SharedCache._acquire_sync("k")  # 다른 워커가 계산 중
+        return await asyncio.gather(SharedCache.get_or_create("k", 10, factory), other_worker())
+
+    value, _ = asyncio.run(main())
+
+    assert value == "theirs"
+    assert calls == 0
+
+
+def test_expired_lock_is_taken_over(monkeypatch):
+    monkeypatch.setattr(SharedCache, "LOCK_TTL", 0.1)
+    calls = 0
+
+    async def factory():
+        nonlocal calls
+        calls += 1
+        return "computed"
+
+    async def main():
+        assert SharedCache._acquire_sync("k")  # 계산 중 죽은 워커의 잠금
+        return await SharedCache.get_or_create("k", 10, factory)
+
+    assert asyncio.run(main()) == "computed"
+    assert calls == 1
+    assert SharedCache.get_sync("k") == "computed"
+
+
+def test_leader_cancel_does_not_cancel_followers():
+    calls = 0
+
+    async def factory():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return calls
+
+    async def main():
+        leader = asyncio.create_task(SharedCache.get_or_create("k", 10, factory))
+        await asyncio.sleep(0.01)
+        follower = asyncio.create_task(SharedCache.get_or_create("k", 10, factory))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        return await follower, leader.cancelled()
+
+    value, leader_cancelled = asyncio.run(main())
+
+    assert leader_cancelled
+    assert value == 2  # 재시도한 요청이 직접 계산
+
+
+def test_should_cache_false_is_not_stored():
+    async def factory():
+        return {"description": "에러"}
+
+    value = asyncio.run(SharedCache.get_or_create("k", 10, factory, should_cache=lambda v: False))
+
+    assert value == {"description": "에러"}
+    assert SharedCache.get_sync("k") is None
+
+
+def test_raw_mode_stores_bytes_as_is():
+    async def factory():
+        return b'{"description":"\xec\x9a\x94\xec\x95\xbd"}'
+
+    value = asyncio.run(SharedCache.get_or_create("k", 10, factory, raw=True))
+
+    assert value == '{"description":"요약"}'.encode("utf-8")
+    assert SharedCache.get_raw_sync("k") == value
+    assert SharedCache.get_sync("k") == {"description": "요약"}
+
+
+def test_expired_value_is_deleted_on_read():
+    SharedCache.set_sync("k", "old", -1)
+
+    assert SharedCache.get_sync("k") is None
+    assert SharedCache._fetchone("SELECT COUNT(*) FROM cache")[0] == 0
+
+
+def test_purge_removes_expired_and_caps_rows(monkeypatch):
+    monkeypatch.setattr(SharedCache, "MAX_ROWS", 3)
+    SharedCache.set_sync("expired", "x", -1)
+    for i in range(5):
+        SharedCache.set_sync(f"k{i}", i, 10 + i)
+
+    assert SharedCache.purge_expired_sync() == 3
+    assert [SharedCache.get_sync(f"k{i}") for i in range(5)] == [None, None, 2, 3, 4]
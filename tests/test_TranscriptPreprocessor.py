@@ -0,0 +1,68 @@
+from youtube_transcript_api import FetchedTranscriptSnippet
+
+from domain.service.TranscriptPreprocessor import TranscriptPreprocessor
+
+
+def snippet(text: str, start: float) -> FetchedTranscriptSnippet:
+    return FetchedTranscriptSnippet(text=text, start=start, duration=1.0)
+
+
+def test_slice_by_time_includes_both_boundaries():
+    snippets = [snippet(str(start), start) for start in (5.0, 10.0, 11.0, 600.0, 600.5)]
+
+    window = TranscriptPreprocessor.slice_by_time(snippets, 10.0, 600.0)
+
+    assert [s.start for s in window] == [10.0, 11.0, 600.0]
+    assert TranscriptPreprocessor.slice_by_time(snippets, 700.0, 800.0) == []
+    assert TranscriptPreprocessor.slice_by_time([], 10.0, 600.0) == []
+
+
+def test_normalize_keeps_spaces_between_words():
+    assert TranscriptPreprocessor.normalize("[음악]  오늘은   캠핑 의자를\n소개합니다!!!") == "오늘은 캠핑 의자를 소개합니다!"
+    assert TranscriptPreprocessor.normalize("(박수)") == ""
+
+
+def test_dedupe_drops_exact_repeats():
+    lines = ["안녕하세요 여러분", "안녕하세요 여러분", "오늘은 캠핑", "안녕하세요 여러분"]
+
+    assert TranscriptPreprocessor.dedupe(lines) == ["안녕하세요 여러분", "오늘은 캠핑"]
+
+
+def test_dedupe_replaces_line_extended_by_next():
+    lines = ["오늘은 캠핑 의자를", "오늘은 캠핑 의자를 소개합니다"]
+
+    assert TranscriptPreprocessor.dedupe(lines) == ["오늘은 캠핑 의자를 소개합니다"]
+
+
+def test_dedupe_strips_rolling_caption_overlap():
+    lines = ["오늘은 캠핑 의자를 소개합니다", "의자를 소개합니다 먼저 무게는"]
+
+    assert TranscriptPreprocessor.dedupe(lines) == ["오늘은 캠핑 의자를 소개합니다", "먼저 무게는"]
+
+
+def test_dedupe_keeps_short_repeated_words():
+    # 짧은 줄은 앞뒤 줄과 글자가 겹쳐도 실제 발화이므로 유지 (완전히 같은 줄 반복만 제거)
+    assert TranscriptPreprocessor.dedupe(["캠핑 의자를 샀어요", "캠핑"]) == ["캠핑 의자를 샀어요", "캠핑"]
+    assert TranscriptPreprocessor.dedupe(["그런데 캠핑은", "그"]) == ["그런데 캠핑은", "그"]
+    assert TranscriptPreprocessor.dedupe(["캠핑", "캠핑장에서"]) == ["캠핑", "캠핑장에서"]
+    assert TranscriptPreprocessor.dedupe(["좋아요 정말 좋아요", "좋아요"]) == ["좋아요 정말 좋아요", "좋아요"]
+
+
+def test_trim_to_budget_truncates_single_oversized_line():
+    line = "캠핑 " * 100
+
+    result = TranscriptPreprocessor.trim_to_budget([line.strip()], 10)
+
+    assert len(result) == 1
+    assert result[0].startswith("캠핑 캠핑")
+    assert TranscriptPreprocessor.count_tokens(result[0]) < 10
+
+
+def test_trim_to_budget_keeps_lines_within_budget():
+    lines = [f"문장 {i}" for i in range(100)]
+
+    result = TranscriptPreprocessor.trim_to_budget(lines, 60)
+
+    assert 0 < len(result) < len(lines)
+    assert sum(TranscriptPreprocessor.count_tokens(line) + 1 for line in result) <= 60
+    assert TranscriptPreprocessor.trim_to_budget(lines[:3], 60) == lines[:3]
@@ -0,0 +1,52 @@
+import asyncio
+import random
+
+import pytest
+
+from common.replay.UpstreamRecorder import RecordedUpstreamError, UpstreamNotRecorded, UpstreamRecorder
+
+
+@pytest.fixture(autouse=True)
+def recorder(tmp_path, monkeypatch):
+    monkeypatch.setattr(UpstreamRecorder, "trace_dir", str(tmp_path))
+    monkeypatch.setattr(UpstreamRecorder, "replay_latency", False)
+    monkeypatch.setattr(UpstreamRecorder, "_traces", None)
+    monkeypatch.setattr(UpstreamRecorder, "_cursors", {})
+    yield UpstreamRecorder
+
+
+def switch_to_replay(monkeypatch):
+    monkeypatch.setattr(UpstreamRecorder, "mode", "replay")
+    monkeypatch.setattr(UpstreamRecorder, "_traces", None)
+
+
+def test_random_choice_inside_call_replays(monkeypatch):
+    monkeypatch.setattr(UpstreamRecorder, "mode", "record")
+    request = {"query": "캠핑", "options": ["의자", "텐트", "랜턴"]}
+
+    async def search():
+        return {"query": f"캠핑 {random.choice(request['options'])}"}
+
+    recorded = asyncio.run(UpstreamRecorder.call("naver.local", request, search))
+    switch_to_replay(monkeypatch)
+    replayed = asyncio.run(UpstreamRecorder.call("naver.local", request, search))
+
+    assert replayed == recorded
+
+
+def test_upstream_error_is_recorded_and_raised_on_replay(monkeypatch):
+    monkeypatch.setattr(UpstreamRecorder, "mode", "record")
+
+    async def fail():
+        raise TimeoutError("upstream timed out")
+
+    with pytest.raises(TimeoutError):
+        asyncio.run(UpstreamRecorder.call("openai", {"input": "a"}, fail))
+
+    switch_to_replay(monkeypatch)
+    with pytest.raises(RecordedUpstreamError) as e:
+        asyncio.run(UpstreamRecorder.call("openai", {"input": "a"}, fail))
+    assert e.value.error_type == "TimeoutError"
+
+    with pytest.raises(UpstreamNotRecorded):
+        asyncio.run(UpstreamRecorder.call("openai", {"input": "b"}, fail))
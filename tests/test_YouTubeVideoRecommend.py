@@ -0,0 +1,134 @@
+import asyncio
+import json
+
+import httpx
+import openai
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from common.cache.SharedCache import SharedCache
+from common.config.environment import RECOMMEND_CACHE_CONTROL
+from common.exceptionHandler.Handlers import init_exception_handler
+from common.response.HttpCache import NO_STORE
+from domain.controller import YouTubeVideoRecommend as controller
+from domain.DTO.VideoInfoDTO import VideoInfoDTO
+from domain.service.YoutubeRecommend import YoutubeRecommend
+from domain.service.YoutubeSummary import YoutubeSummary
+
+URL = "/api/recommend/youtube"
+QUERY = {"interest_scores": json.dumps({"캠핑": 10, "러닝화": 5}, ensure_ascii=False)}
+
+
+@pytest.fixture(autouse=True)
+def shared_cache(tmp_path):
+    SharedCache.close()
+    SharedCache.open(str(tmp_path / "cache.sqlite3"))
+    SharedCache._inflight.clear()
+    yield SharedCache
+    SharedCache.close()
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    controller.init_YouTubeVideoRecommend_controller(app)
+    init_exception_handler(app)
+    return TestClient(app)
+
+
+# 검색 호출 수 (캐시 미스에서만 증가)
+@pytest.fixture
+def searches(monkeypatch):
+    calls = []
+
+    async def search_videos_by_keyword_list(keywords, max_results):
+        calls.append(keywords)
+        return [VideoInfoDTO.model_construct(id="video", title=keywords[0])]
+
+    monkeypatch.setattr(YoutubeRecommend, "search_videos_by_keyword_list", search_videos_by_keyword_list)
+    return calls
+
+
+def gpt_keywords(monkeypatch, fail: bool):
+    async def create_interest_keyword(interest_scores, max_search_keyword):
+        if fail:
+            raise openai.APIConnectionError(request=httpx.Request("POST", "https://api.openai.com/v1/responses"))
+        return ["캠핑 용품"]
+
+    monkeypatch.setattr(YoutubeSummary, "create_interest_keyword", create_interest_keyword)
+
+
+def test_repeated_get_with_etag_is_not_modified(client, searches, monkeypatch):
+    gpt_keywords(monkeypatch, fail=False)
+
+    first = client.get(URL, params=QUERY)
+    etag = first.headers["etag"]
+    second = client.get(URL, params=QUERY, headers={"If-None-Match": etag})
+
+    assert first.status_code == 200
+    assert first.json()["meta"]["search_keyword"] == ["캠핑 용품"]
+    assert first.json()["data"][0]["id"] == "video"
+    assert etag.startswith('W/"')
+    assert first.headers["cache-control"] == RECOMMEND_CACHE_CONTROL
+    assert second.status_code == 304
+    assert second.headers["etag"] == etag
+    assert len(searches) == 1
+
+
+def test_fallback_result_is_not_cached(client, searches, monkeypatch):
+    gpt_keywords(monkeypatch, fail=True)
+
+    first = client.get(URL, params=QUERY)
+    second = client.get(URL, params=QUERY, headers={"If-None-Match": first.headers["etag"]})
+
+    assert first.status_code == 200
+    assert first.headers["cache-control"] == NO_STORE
+    assert first.json()["meta"]["search_keyword"] == ["캠핑"]  # 로컬 키워드
+    assert second.status_code == 200
+    assert len(searches) == 2
+
+
+def test_post_ignores_if_none_match(client, searches, monkeypatch):
+    gpt_keywords(monkeypatch, fail=False)
+    etag = client.get(URL, params=QUERY).headers["etag"]
+
+    response = client.post(URL, json={"interest_scores": {"캠핑": 10, "러닝화": 5}}, headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert "etag" not in response.headers
+    assert len(searches) == 1  # 서버 캐시는 공유
+
+
+@pytest.mark.parametrize("interest_scores", ["{", "[1, 2]", '{"캠핑": "많이"}'])
+def test_malformed_interest_scores_is_bad_request(client, searches, interest_scores):
+    response = client.get(URL, params={"interest_scores": interest_scores})
+
+    assert response.status_code == 400
+    assert searches == []
+
+
+def test_openai_failure_counts_as_summary_limiter_failure(monkeypatch):
+    limiter = controller.AdaptiveLimiter("test-summary", target_latency=10.0, initial_limit=8)
+    monkeypatch.setattr(controller, "summary_limiter", limiter)
+
+    async def get_video_details(video_ids):
+        return [VideoInfoDTO.model_construct(id=video_ids[0], description="캠핑 의자 리뷰 " * 10)]
+
+    async def get_video_subtitles(video_details):
+        return None
+
+    async def create_response(request):
+        response = httpx.Response(429, request=httpx.Request("POST", "https://api.openai.com/v1/responses"))
+        raise openai.RateLimitError("rate limited", response=response, body=None)
+
+    monkeypatch.setattr(YoutubeRecommend, "get_video_details", get_video_details)
+    monkeypatch.setattr(YoutubeRecommend, "get_video_subtitles", get_video_subtitles)
+    monkeypatch.setattr(YoutubeSummary, "create_response", create_response)
+
+    summary = asyncio.run(controller.create_limited_video_summary("video"))
+
+    assert summary == {"description": YoutubeSummary.SUMMARY_ERROR_MESSAGE}
+    assert not controller.is_cacheable_summary(summary)
+    assert limiter.limit < 8
+    assert limiter.in_flight == 0